@@ -1,10 +1,31 @@
 # server.py
 from mcp.server.fastmcp import FastMCP
+import importlib
+import re
 import numpy as np
+import src.orbitTools as orbitTools
+import src.dateMJD as dateMJD
+from src.orbit_prediction_two_body import orbit_prediction_two_body as run_orbit_prediction_two_body
+from src.orbit_prediction_two_body import orbit_prediction_two_body_batch as run_orbit_prediction_two_body_batch
+from src.orbit_prediction_numerical import run_orbitPrediction_numerical, run_orbitPrediction_numerical_batch
+from src.observation_station_satellite import run_satellite_observation
+from src.tool_initialOrbitDetermination import initial_orbit_determination as iod_func
 
 # Create an MCP server
 mcp = FastMCP("mcp-server-satOrbit")
 
+# Plotting modules pull in matplotlib/cartopy, so they are imported on first use
+# and kept here for later calls
+_PLOT_MODULES = {}
+
+def _load_plot_module(name):
+    """Import src.<name> on first use and return the cached module afterwards"""
+    module = _PLOT_MODULES.get(name)
+    if module is None:
+        module = importlib.import_module(f"src.{name}")
+        _PLOT_MODULES[name] = module
+    return module
+
 # 1 tools about orbital basics
 
 # 1.1 Convert Keplerian elements to Cartesian coordinates
@@ -30,16 +51,8 @@ def kpl2cts(elements: list[float]) -> list[float]:
     Example:
     kpl2cts([7000.0, 0.001, 45.0, 90.0, 0.0, 0.0])
     """
-    import src.orbitTools as orbitTools
-    
-    # Convert input list to numpy array to avoid modifying the original list
-    elements_array = np.array(elements, dtype=float)
-    
-    # Call the orbital tools function
-    result = orbitTools.kpl2cts(elements_array)
-    
-    # Convert numpy array back to Python list
-    return result.tolist()
+    # Scalar path: six floats in, six floats out, no intermediate arrays
+    return list(orbitTools.kpl2cts_scalar(*map(float, elements)))
 
 # 1.2 Convert Cartesian coordinates to Keplerian elements
 @mcp.tool()
@@ -65,16 +78,8 @@ def cts2kpl(cartesian: list[float]) -> list[float]:
     Example:
     cts2kpl([7000.0, 0.0, 0.0, 0.0, 7.5, 0.0])
     """
-    import src.orbitTools as orbitTools
-    
-    # Convert input list to numpy array
-    cartesian_array = np.array(cartesian, dtype=float)
-    
-    # Call the orbital tools function
-    result = orbitTools.cts2kpl(cartesian_array)
-    
-    # Convert numpy array back to Python list
-    return result.tolist()
+    # Scalar path: six floats in, six floats out, no intermediate arrays
+    return list(orbitTools.cts2kpl_scalar(*map(float, cartesian)))
 
 # 1.3 convert date to Modified Julian date
 @mcp.tool()
@@ -92,8 +97,7 @@ def date2mjd(date: str) -> float:
     date2mjd("2000-01-01 00:00:00") returns 51544.0
     date2mjd("2000-01-01") returns 51544.0
     """
-    from src.dateMJD import date2mjd
-    mjd = date2mjd(date)
+    mjd = dateMJD.date2mjd(date)
     return mjd
 
 # 1.4 convert Modified Julian date to date
@@ -112,11 +116,58 @@ def mjd2date(mjd: float) -> str:
     mjd2date(51544.0) returns "2000-01-01 00:00:00"
     mjd2date(51544.5) returns "2000-01-01 12:00:00"
     """
-    # Convert MJD to Julian Date
-    from src.dateMJD import mjd2date
-    date_str = mjd2date(mjd)
+    date_str = dateMJD.mjd2date(mjd)
     return date_str
 
+# 1.5 Batch convert Keplerian elements to Cartesian coordinates
+@mcp.tool()
+def kpl2cts_batch(elements: list[list[float]]) -> list[list[float]]:
+    """
+    Convert a batch of Keplerian element sets to Cartesian coordinates in one call
+
+    Parameters:
+    elements: List of N Keplerian element sets, each [a, e, i, C_omega, omega, M]
+        with the same units as kpl2cts (km, dimensionless, degrees)
+
+    Returns:
+    list: List of N Cartesian states, each [x, y, z, vx, vy, vz] (km, km/s)
+
+    Example:
+    kpl2cts_batch([[7000.0, 0.001, 45.0, 90.0, 0.0, 0.0],
+                   [26578.0, 0.01, 55.0, 100.0, 0.0, 0.0]])
+    """
+    elements_array = np.asarray(elements, dtype=np.float64).reshape(-1, 6)
+
+    # Convert the whole batch with the vectorized kernel
+    result = orbitTools.kpl2cts_vec(elements_array)
+
+    return result.tolist()
+
+# 1.6 Batch convert Cartesian coordinates to Keplerian elements
+@mcp.tool()
+def cts2kpl_batch(cartesian: list[list[float]]) -> list[list[float]]:
+    """
+    Convert a batch of Cartesian states to Keplerian elements in one call
+
+    Parameters:
+    cartesian: List of N Cartesian states, each [x, y, z, vx, vy, vz]
+        with the same units as cts2kpl (km, km/s)
+
+    Returns:
+    list: List of N Keplerian element sets, each [a, e, i, C_omega, omega, M]
+        (km, dimensionless, degrees)
+
+    Example:
+    cts2kpl_batch([[7000.0, 0.0, 0.0, 0.0, 7.5, 0.0],
+                   [0.0, 7000.0, 0.0, -7.5, 0.0, 0.0]])
+    """
+    cartesian_array = np.asarray(cartesian, dtype=np.float64).reshape(-1, 6)
+
+    # Convert the whole batch with the vectorized kernel
+    result = orbitTools.cts2kpl_vec(cartesian_array)
+
+    return result.tolist()
+
 # 2 orbit prediction
 
 # 2.1 orbit prediction in two-body problem
@@ -144,6 +195,7 @@ def orbit_prediction_two_body(
     duration: Total prediction time duration (minutes)
     fnEph: Output ephemeris filename (absolute path)
         Format: MJD_day, MJD_sec, x, y, z, vx, vy, vz
+        A ".npy" filename saves the ephemeris as a numpy binary array instead
     
     Returns:
     str: Result message indicating success and final Keplerian elements
@@ -157,8 +209,7 @@ def orbit_prediction_two_body(
         "c:/satellite_eph.txt"         # Output file
     )
     """
-    from src.orbit_prediction_two_body import orbit_prediction_two_body
-    elements1 = orbit_prediction_two_body(t0, elements0, step, duration, fnEph)
+    elements1 = run_orbit_prediction_two_body(t0, elements0, step, duration, fnEph)
     result = f"orbit prediction successful, ephemeris saved to {fnEph}.\n"
     result = result + f"Final Keplerian elements: {elements1}"
     # Return the final Keplerian elements
@@ -290,8 +341,6 @@ def orbit_prediction_numerical(
         K_SRP=1
     )
     """
-    from src.orbit_prediction_numerical import run_orbitPrediction_numerical
-    
     # Call the orbit prediction function
     result = run_orbitPrediction_numerical(
         start_time=start_time,
@@ -319,12 +368,108 @@ def orbit_prediction_numerical(
 
     return result
 
+# 2.3 batch orbit prediction in two-body problem
+@mcp.tool()
+def orbit_prediction_two_body_batch(
+    t0: list[float],
+    elements0_batch: list[list[float]],
+    step: float,
+    duration: float,
+    fnEph_prefix: str = "eph"
+) -> str:
+    """
+    Predict several satellite orbits (e.g. a constellation) using two-body problem dynamics,
+    propagating all satellites in parallel
+    
+    Parameters:
+    t0: Initial time as [year, month, day, hour, minute, second], shared by all satellites
+    elements0_batch: List of initial Keplerian elements, each [a, e, i, Omega, omega, M]
+        (units as in orbit_prediction_two_body)
+    step: Time step for prediction (minutes)
+    duration: Total prediction time duration (minutes)
+    fnEph_prefix: Output ephemeris filename prefix (absolute path)
+        Satellite k is written to "{fnEph_prefix}_{k:04d}.txt"
+        Format: MJD_day, MJD_sec, x, y, z, vx, vy, vz
+    
+    Returns:
+    str: Result message indicating success and final Keplerian elements of each satellite
+
+    Example:
+    orbit_prediction_two_body_batch(
+        [2000, 1, 1, 0, 0, 0],
+        [[7000.0, 0.001, 45.0, 90.0, 0.0, 0.0],
+         [7000.0, 0.001, 45.0, 90.0, 0.0, 120.0]],
+        10.0,
+        1440.0,
+        "c:/constellation_eph"     # Writes c:/constellation_eph_0000.txt, ..._0001.txt
+    )
+    """
+    elements1 = run_orbit_prediction_two_body_batch(t0, elements0_batch, step, duration, fnEph_prefix)
+    result = f"orbit prediction successful, {len(elements1)} ephemeris files saved to {fnEph_prefix}_XXXX.txt.\n"
+    result = result + f"Final Keplerian elements: {elements1}"
+    return result
+
+# 2.4 batch numerical high-precision orbit prediction
+@mcp.tool()
+def orbit_prediction_numerical_batch(jobs: list[dict]) -> list[str]:
+    """
+    Run several numerical high-precision orbit predictions concurrently.
+    
+    The executables run in parallel, at most one per CPU core, so independent
+    propagations (e.g. several satellites or force model settings) finish in
+    about the time of the slowest one instead of the sum of all.
+    
+    Parameters:
+    -----------
+    jobs : list of dict
+        One dict per prediction, with the same keys as orbit_prediction_numerical:
+        start_time, kepler0, end_time, step, filename (required) and
+        ephType, Cd, amrDrag, F107, Ap, reflectivity, amrSRP, order,
+        K_tesseral, K_lunar, K_lunarTide, K_solor, K_solarTide, K_SRP, K_drag, K_PN (optional)
+    
+    Returns:
+    --------
+    list of str: Result message of each prediction, in the order of jobs
+    
+    Examples:
+    ---------
+    result = orbit_prediction_numerical_batch([
+        {"start_time": "2023 01 01 12 00 00.000", "kepler0": "7000 0.01 45 30 60 90",
+         "end_time": "2023 01 02 12 00 00.000", "step": 60, "filename": "sat1.txt"},
+        {"start_time": "2023 01 01 12 00 00.000", "kepler0": "7200 0.01 98 0 0 0",
+         "end_time": "2023 01 02 12 00 00.000", "step": 60, "filename": "sat2.txt", "K_drag": 1}
+    ])
+    """
+    return run_orbitPrediction_numerical_batch(jobs)
+
 # 3 satellite observation
+
+# Observation types accepted by observation_station_satellite
+_VALID_OBS_TYPES = frozenset({11, 12, 13, 14, 15, 16, 17, 19})
+
+# Time strings accepted by observation_station_satellite: "YYYY MM DD HH MM SS"
+_OBS_TIME_PATTERN = re.compile(r'^\d{4}\s+\d{1,2}\s+\d{1,2}\s+\d{1,2}\s+\d{1,2}\s+\d{1,2}$')
+
+def _convert_time_format(time_str):
+    """Convert 'YYYY MM DD HH MM SS' to 'YYYY-MM-DD HH:MM:SS' format"""
+    time_str = time_str.strip()
+    if not _OBS_TIME_PATTERN.match(time_str):
+        raise ValueError(f"Invalid time format: {time_str}. Expected format: 'YYYY MM DD HH MM SS'")
+    
+    year, month, day, hour, minute, second = map(int, time_str.split())
+    return f"{year:04d}-{month:02d}-{day:02d} {hour:02d}:{minute:02d}:{second:02d}"
+
+def _time_to_mjd(time):
+    """Return MJD for a 'YYYY MM DD HH MM SS' string, or the value itself if it is already MJD"""
+    if isinstance(time, (int, float)):
+        return float(time)
+    return dateMJD.date2mjd(_convert_time_format(time))
+
 @mcp.tool()
 def observation_station_satellite(
-    ts: str,
+    ts: str | float,
     step: float,
-    te: str,
+    te: str | float,
     longitude: float,
     latitude: float,
     altitude: float,
@@ -354,14 +499,14 @@ def observation_station_satellite(
     
     Parameters:
     -----------
-    ts : str
-        Start time in format "YYYY MM DD HH MM SS"
-        Example: "2025 01 01 12 00 00"
+    ts : str or float
+        Start time in format "YYYY MM DD HH MM SS", or directly as MJD
+        Example: "2025 01 01 12 00 00" or 60676.5
     step : float
         Time step in seconds for calculations
-    te : str
-        End time in format "YYYY MM DD HH MM SS"
-        Example: "2025 01 02 12 00 00"
+    te : str or float
+        End time in format "YYYY MM DD HH MM SS", or directly as MJD
+        Example: "2025 01 02 12 00 00" or 60677.5
     longitude : float
         Observer longitude in degrees (-180 to 180, East positive)
     latitude : float
@@ -419,52 +564,43 @@ def observation_station_satellite(
     )
     """
     
-    # Convert time strings to MJD format
-    def convert_time_format(time_str):
-        """Convert 'YYYY MM DD HH MM SS' to 'YYYY-MM-DD HH:MM:SS' format"""
-        parts = time_str.strip().split()
-        if len(parts) != 6:
-            raise ValueError(f"Invalid time format: {time_str}. Expected format: 'YYYY MM DD HH MM SS'")
-        
-        year, month, day, hour, minute, second = parts
-        return f"{year}-{month.zfill(2)}-{day.zfill(2)} {hour.zfill(2)}:{minute.zfill(2)}:{second.zfill(2)}"
-    
     try:
-        # Convert time strings to date2mjd compatible format
-        ts_formatted = convert_time_format(ts)
-        te_formatted = convert_time_format(te)
-        
-        # Convert to MJD using the existing date2mjd function
-        from src.dateMJD import date2mjd
-        ts_mjd = date2mjd(ts_formatted)
-        te_mjd = date2mjd(te_formatted)
+        if isinstance(ts, str) and isinstance(te, str):
+            # Convert both time strings to MJD in one call
+            ts_mjd, te_mjd = dateMJD.date2mjd_batch([_convert_time_format(ts), _convert_time_format(te)])
+        else:
+            # MJD values are used as given
+            ts_mjd = _time_to_mjd(ts)
+            te_mjd = _time_to_mjd(te)
         
     except Exception as e:
         return f"Error: Time format conversion failed - {str(e)}"
     
-    # Validate input parameters
+    # Validate input parameters, reporting every violation at once
+    errors = []
     if not (-180 <= longitude <= 180):
-        return f"Error: Longitude must be between -180 and 180 degrees, got {longitude}"
+        errors.append(f"Longitude must be between -180 and 180 degrees, got {longitude}")
     
     if not (-90 <= latitude <= 90):
-        return f"Error: Latitude must be between -90 and 90 degrees, got {latitude}"
+        errors.append(f"Latitude must be between -90 and 90 degrees, got {latitude}")
     
     if not (0 <= min_ele <= 90):
-        return f"Error: Minimum elevation must be between 0 and 90 degrees, got {min_ele}"
+        errors.append(f"Minimum elevation must be between 0 and 90 degrees, got {min_ele}")
     
     if ts_mjd >= te_mjd:
-        return f"Error: Start time ({ts}) must be before end time ({te})"
+        errors.append(f"Start time ({ts}) must be before end time ({te})")
     
     if step <= 0:
-        return f"Error: Time step must be positive, got {step}"
+        errors.append(f"Time step must be positive, got {step}")
     
     # Validate observation type
-    valid_obs_types = [11, 12, 13, 14, 15, 16, 17, 19]
-    if obs_type not in valid_obs_types:
-        return f"Error: Invalid observation type {obs_type}. Valid types: {valid_obs_types}"
+    if obs_type not in _VALID_OBS_TYPES:
+        errors.append(f"Invalid observation type {obs_type}. Valid types: {sorted(_VALID_OBS_TYPES)}")
+    
+    if errors:
+        return "Error: " + "; ".join(errors)
     
     # Call the satellite observation function with MJD values
-    from src.observation_station_satellite import run_satellite_observation
     result = run_satellite_observation(
         ts=ts_mjd,
         step=step,
@@ -545,7 +681,7 @@ def plot_orbit(
     
     try:
         # Call the plot_satellite function
-        from src.plot_satellite import plot_satellite
+        plot_satellite = _load_plot_module("plot_satellite").plot_satellite
         
         plot_satellite(
             ephemeris_file=ephemeris_file,
@@ -564,6 +700,10 @@ def plot_orbit(
         return f"Error: Plot generation failed - {str(e)}"
     
 # 4.2 satellite access visualization
+
+# Observation data types accepted by plot_access
+_VALID_PLOT_OBS = frozenset({'Azi_Ele', 'RA_DEC', 'R_RD'})
+
 @mcp.tool()
 def plot_access(
     access_file_path: str,
@@ -628,14 +768,13 @@ def plot_access(
     """
     
     # Validate observation type
-    valid_obs_types = ['Azi_Ele', 'RA_DEC', 'R_RD']
-    if obs_type not in valid_obs_types:
-        return f"Error: Invalid observation type '{obs_type}'. Valid types: {valid_obs_types}"
+    if obs_type not in _VALID_PLOT_OBS:
+        return f"Error: Invalid observation type '{obs_type}'. Valid types: {sorted(_VALID_PLOT_OBS)}"
     
     try:
-        from src.plot_access import plot_access
+        plot_access_func = _load_plot_module("plot_access").plot_access
         
-        plot_result = plot_access(access_file_path, station_name, satellite_name, obs_type, output_file)
+        plot_result = plot_access_func(access_file_path, station_name, satellite_name, obs_type, output_file)
         
         # Determine the actual output file path for the return message
         if output_file:
@@ -699,9 +838,9 @@ def plot_station(station_data_str: str, output_file: str = None) -> str:
     """
     
     try:
-        from src.plot_station import plot_station
+        plot_station_func = _load_plot_module("plot_station").plot_station
         
-        plot_station(station_data_str, output_file)
+        plot_station_func(station_data_str, output_file)
         
         # Determine the actual output file path for the return message
         if output_file:
@@ -741,8 +880,6 @@ def initial_orbit_determination(
     Returns:
         str: Program execution output
     """
-    from src.tool_initialOrbitDetermination import initial_orbit_determination as iod_func
-    
     try:
         result = iod_func(
             longitude=longitude,
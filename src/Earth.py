@@ -1,8 +1,28 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from PIL import Image
+from mpl_toolkits.mplot3d.art3d import Poly3DCollection
+import functools
 import os
 
+
+@functools.lru_cache(maxsize=4)
+def _load_texture_array(texture_path, mtime):
+    """
+    解码贴图文件为numpy数组，结果按 (文件路径, 修改时间) 缓存，同一进程内只解码一次
+    
+    参数:
+    texture_path (str): 贴图文件路径
+    mtime (float): 文件修改时间，仅用作缓存键
+    
+    返回:
+    np.array: 贴图像素数组（只读）
+    """
+    with Image.open(texture_path) as image:
+        texture_array = np.array(image)
+    texture_array.setflags(write=False)
+    return texture_array
+
 class Earth:
     """
     简化的地球类，用于绘制带纹理的地球模型
@@ -24,6 +44,9 @@ class Earth:
         self.resolution = resolution
         self.use_texture = use_texture
         self.texture_image = None
+        self._texture_array = None   # 解码后的贴图像素
+        self._texture_colors = None  # 球面网格对应的贴图颜色，首次绘制时计算
+        self._quad_colors = None     # 每个四边形面片的颜色（取左上角网格点的颜色）
         
         # 加载贴图
         if self.use_texture:
@@ -36,8 +59,12 @@ class Earth:
         """
         加载地球贴图
         """
+        self._texture_array = None
+        self._texture_colors = None
+        self._quad_colors = None
         try:
             if os.path.exists(self.texture_path):
+                self._texture_array = _load_texture_array(self.texture_path, os.path.getmtime(self.texture_path))
                 self.texture_image = Image.open(self.texture_path)
             else:
                 print(f"警告: 找不到贴图文件 {self.texture_path}")
@@ -55,10 +82,18 @@ class Earth:
         u = np.linspace(0, 2 * np.pi, self.resolution)
         v = np.linspace(0, np.pi, self.resolution)
         
+        # 三角函数表只计算一次：u方向为列向量(R,1)，v方向为行向量(1,R)，通过广播生成网格
+        self._cos_u = np.cos(u)[:, np.newaxis]
+        self._sin_u = np.sin(u)[:, np.newaxis]
+        self._sin_v = np.sin(v)[np.newaxis, :]
+        self._cos_v = np.cos(v)[np.newaxis, :]
+        
         # 保存原始坐标，用于旋转计算
-        self.x_original = self.radius * np.outer(np.cos(u), np.sin(v))
-        self.y_original = self.radius * np.outer(np.sin(u), np.sin(v))
-        self.z_original = self.radius * np.outer(np.ones(np.size(u)), np.cos(v))
+        self.x_original = self.radius * (self._cos_u * self._sin_v)
+        self.y_original = self.radius * (self._sin_u * self._sin_v)
+        self.z_original = self.radius * np.ones_like(self._cos_u) * self._cos_v
+        self._texture_colors = None
+        self._quad_colors = None
         
         # 当前显示坐标（初始时等于原始坐标）
         self.x = self.x_original.copy()
@@ -79,10 +114,12 @@ class Earth:
         cos_theta = np.cos(theta_rad)
         sin_theta = np.sin(theta_rad)
         
-        # 应用旋转变换
-        self.x = self.x_original * cos_theta - self.y_original * sin_theta
-        self.y = self.x_original * sin_theta + self.y_original * cos_theta
-        self.z = self.z_original.copy()  # z坐标不变
+        # 旋转只改变经度方向，先在(R,1)向量上计算 cos(u+theta)、sin(u+theta)，再广播成网格
+        cos_u_rot = cos_theta * self._cos_u - sin_theta * self._sin_u
+        sin_u_rot = sin_theta * self._cos_u + cos_theta * self._sin_u
+        self.x = self.radius * (cos_u_rot * self._sin_v)
+        self.y = self.radius * (sin_u_rot * self._sin_v)
+        self.z = self.z_original  # z坐标不变
     
     def plot_earth(self, ax):
         """
@@ -96,42 +133,92 @@ class Earth:
         else:
             self._plot_earth_simple(ax)
     
+    def get_texture_colors(self):
+        """
+        获取球面网格各点对应的贴图颜色（首次调用时计算并缓存）
+        
+        返回:
+        np.array: 颜色数组，形状(resolution, resolution, 3或4)，取值0~1
+        """
+        if self._texture_colors is None:
+            self._texture_colors = self._compute_texture_colors()
+        return self._texture_colors
+    
+    def _compute_texture_colors(self):
+        """
+        计算球面网格各点对应的贴图颜色
+        
+        颜色只取决于原始坐标和贴图，旋转不会改变，因此只计算一次并缓存
+        
+        返回:
+        np.array: 颜色数组，形状(resolution, resolution, 3或4)，取值0~1
+        """
+        # 已解码的贴图像素（加载贴图时从缓存获得）
+        texture_array = self._texture_array
+        if texture_array is None:
+            texture_array = np.array(self.texture_image)
+        
+        # 关键：使用原始坐标计算纹理映射，这样旋转时纹理会保持固定
+        lon = np.arctan2(self.y_original, self.x_original)
+        lat = np.arcsin(np.clip(self.z_original / self.radius, -1, 1))
+        
+        u = (lon + np.pi) / (2 * np.pi)
+        v = (-lat + np.pi/2) / np.pi  # 翻转v坐标，修复上下颠倒问题
+        
+        u = np.clip(u, 0, 1)
+        v = np.clip(v, 0, 1)
+        
+        # 映射到图像像素
+        img_height, img_width = texture_array.shape[:2]
+        u_pixels = np.clip((u * (img_width - 1)).astype(int), 0, img_width - 1)
+        v_pixels = np.clip((v * (img_height - 1)).astype(int), 0, img_height - 1)
+        
+        # 获取颜色值
+        if len(texture_array.shape) == 3:
+            colors = texture_array[v_pixels, u_pixels] / 255.0
+        else:
+            gray_values = texture_array[v_pixels, u_pixels] / 255.0
+            colors = np.stack([gray_values, gray_values, gray_values], axis=-1)
+        
+        return colors
+    
+    def add_textured_surface(self, ax, alpha):
+        """
+        将带贴图的球面作为Poly3DCollection直接添加到3D坐标轴
+        
+        网格是规则的resolution×resolution网格，四边形的顶点可以一次性切片得到，
+        不经过plot_surface逐个面片构造多边形；面片颜色只计算一次，旋转后重复使用
+        
+        参数:
+        ax: matplotlib 3D坐标轴对象
+        alpha (float): 透明度
+        
+        返回:
+        Poly3DCollection: 添加的球面对象
+        """
+        if self._quad_colors is None:
+            colors = self.get_texture_colors()
+            self._quad_colors = colors[:-1, :-1].reshape(-1, colors.shape[-1])
+        
+        # 每个四边形的四个角点，顺序与plot_surface一致
+        points = np.stack([self.x, self.y, self.z], axis=-1)
+        verts = np.stack([points[:-1, :-1], points[:-1, 1:], points[1:, 1:], points[1:, :-1]],
+                         axis=2).reshape(-1, 4, 3)
+        
+        had_data = ax.has_data()
+        surface = Poly3DCollection(verts, facecolors=self._quad_colors, edgecolors=self._quad_colors,
+                                   alpha=alpha, antialiased=False, shade=False)
+        ax.add_collection3d(surface)
+        ax.auto_scale_xyz(self.x, self.y, self.z, had_data)
+        return surface
+    
     def _plot_earth_with_texture(self, ax):
         """
         使用贴图绘制地球
         """
         try:
-            # 将贴图转换为numpy数组
-            texture_array = np.array(self.texture_image)
-            
-            # 关键：使用原始坐标计算纹理映射，这样旋转时纹理会保持固定
-            lon = np.arctan2(self.y_original, self.x_original)
-            lat = np.arcsin(np.clip(self.z_original / self.radius, -1, 1))
-            
-            u = (lon + np.pi) / (2 * np.pi)
-            v = (-lat + np.pi/2) / np.pi  # 翻转v坐标，修复上下颠倒问题
-            
-            u = np.clip(u, 0, 1)
-            v = np.clip(v, 0, 1)
-            
-            # 映射到图像像素
-            img_height, img_width = texture_array.shape[:2]
-            u_pixels = np.clip((u * (img_width - 1)).astype(int), 0, img_width - 1)
-            v_pixels = np.clip((v * (img_height - 1)).astype(int), 0, img_height - 1)
-            
-            # 获取颜色值
-            if len(texture_array.shape) == 3:
-                colors = texture_array[v_pixels, u_pixels] / 255.0
-            else:
-                gray_values = texture_array[v_pixels, u_pixels] / 255.0
-                colors = np.stack([gray_values, gray_values, gray_values], axis=-1)
-            
             # 绘制地球 - 兼容性修复：移除不支持的参数
-            surface = ax.plot_surface(self.x, self.y, self.z, 
-                                     facecolors=colors,
-                                     alpha=0.7,  # 降低透明度，减少遮挡
-                                     antialiased=False,
-                                     shade=False)
+            surface = self.add_textured_surface(ax, alpha=0.7)  # 降低透明度，减少遮挡
             
             # 手动设置zorder（如果支持的话）
             try:
@@ -1,9 +1,160 @@
 import numpy as np
 import datetime
-from src.orbitTools import kpl2cts
-from astropy.coordinates import GCRS, ITRS, CartesianRepresentation
+import functools
+import os
+import re
+import warnings
+from src.jitTools import njit, NUMBA_AVAILABLE
+from src.orbitTools import kepler_frame, kpl2cts_frame, kpl2cts_soa
+from src.dateMJD import datetimes_to_time
+from astropy.coordinates import GCRS, ITRS, CartesianRepresentation, CartesianDifferential, EarthLocation
+from astropy.coordinates.builtin_frames.utils import get_polar_motion
 from astropy.time import Time
 import astropy.units as u
+import erfa
+
+# 星历数据行的分隔符：空格和/或逗号
+_EPH_SEPARATOR = re.compile(r'[,\s]+')
+
+# 地球自转角变化率（弧度/秒，对应UT1）
+_ERA_RATE = 2.0 * np.pi * 1.00273781191135448 / 86400.0
+
+
+@njit(cache=True, fastmath=True)
+def _propagate_kernel(dt, a, e, i, Omega, omega, M0, n, out):
+    """
+    二体模型逐时刻计算状态向量，结果写入预分配的out数组
+    
+    参数:
+    dt (ndarray): 各时刻相对历元的时间差（秒）
+    a, e, i, Omega, omega, M0 (float): 历元时刻的开普勒根数（km，度）
+    n (float): 平均运动（度/秒）
+    out (ndarray): 输出数组，形状(len(dt), 6)
+    """
+    # 只有平近点角随时间变化，轨道平面的P、Q向量只计算一次
+    frame = kepler_frame(a, e, i, Omega, omega)
+    for k in range(dt.shape[0]):
+        M = M0 + n * dt[k]
+        (out[k, 0], out[k, 1], out[k, 2],
+         out[k, 3], out[k, 4], out[k, 5]) = kpl2cts_frame(frame, M)
+
+
+@functools.lru_cache(maxsize=4)
+def _gcrs_to_itrs_matrices(times, interval=300.0):
+    """
+    计算各时刻GCRS->ITRS的旋转矩阵及其时间导数，结果按时间序列缓存
+    
+    GCRS->ITRS的旋转为 极移矩阵 × R3(地球自转角) × 天球到中间参考系矩阵(c2i)。
+    其中c2i（岁差章动）变化缓慢，只在间隔为interval秒的时间网格上计算并线性插值；
+    地球自转角和极移逐时刻计算。同一场景中的卫星通常共用相同的时间序列，
+    旋转矩阵只与时间有关，因此可以在多颗卫星之间复用。
+    
+    参数:
+    times (tuple): 各时刻的datetime对象（UTC），用作缓存键
+    interval (float): c2i矩阵的插值间隔（秒），为None时逐时刻计算
+    
+    返回:
+    tuple: (旋转矩阵, 旋转矩阵的时间导数)，形状均为(N, 3, 3)（只读）
+    """
+    astropy_times = datetimes_to_time(times)
+    tt = astropy_times.tt
+    ut1 = astropy_times.ut1
+    n = len(times)
+    
+    if interval is None or n < 3:
+        c2i = erfa.c2i06a(tt.jd1, tt.jd2)
+    else:
+        # 相对首个时刻的天数，避免大数相减损失精度
+        t = (tt.jd1 - tt.jd1[0]) + (tt.jd2 - tt.jd2[0])
+        num_grid = int(np.ceil((t.max() - t.min()) * 86400.0 / interval)) + 1
+        grid = np.linspace(t.min(), t.max(), max(num_grid, 2))
+        c2i_grid = erfa.c2i06a(tt.jd1[0] + grid, np.full(len(grid), tt.jd2[0]))
+        c2i = np.empty((n, 3, 3))
+        for row in range(3):
+            for col in range(3):
+                c2i[:, row, col] = np.interp(t, grid, c2i_grid[:, row, col])
+    
+    xp, yp = get_polar_motion(astropy_times)
+    pom = erfa.pom00(xp, yp, erfa.sp00(tt.jd1, tt.jd2))
+    era = erfa.era00(ut1.jd1, ut1.jd2)
+    rot = erfa.c2tcio(c2i, era, pom)
+    
+    # 旋转矩阵的时间导数，只保留地球自转项（岁差章动和极移的变化率可忽略）
+    cos_era, sin_era = np.cos(era), np.sin(era)
+    d_r3 = np.zeros((n, 3, 3))
+    d_r3[:, 0, 0] = -sin_era
+    d_r3[:, 0, 1] = cos_era
+    d_r3[:, 1, 0] = -cos_era
+    d_r3[:, 1, 1] = -sin_era
+    rot_dot = _ERA_RATE * (pom @ d_r3 @ c2i)
+    
+    rot.setflags(write=False)
+    rot_dot.setflags(write=False)
+    return rot, rot_dot
+
+
+def _gcrs_to_itrs_states(times, cartesian, interval=300.0):
+    """
+    用ERFA旋转矩阵将GCRS状态向量批量转换到ITRS
+    
+    参数:
+    times (list): 各时刻的datetime对象（UTC）
+    cartesian (ndarray): GCRS状态向量，形状(N, 6)，单位km和km/s
+    interval (float): c2i矩阵的插值间隔（秒），为None时逐时刻计算
+    
+    返回:
+    ndarray: ITRS状态向量，形状(N, 6)，速度为地固系速度（包含地球自转的影响）
+    """
+    rot, rot_dot = _gcrs_to_itrs_matrices(tuple(times), interval)
+    
+    pos = cartesian[:, :3, None]
+    vel = cartesian[:, 3:6, None]
+    states = np.empty((len(cartesian), 6), order='F')
+    states[:, :3] = (rot @ pos)[:, :, 0]
+    states[:, 3:6] = (rot @ vel + rot_dot @ pos)[:, :, 0]
+    return states
+
+
+@functools.lru_cache(maxsize=8)
+def _load_ephemeris_file(filename, mtime):
+    """
+    读取并解析星历文件，结果按 (文件路径, 修改时间) 缓存，文件被改写后自动失效
+    
+    参数:
+    filename (str): 星历数据文件路径
+    mtime (float): 文件修改时间，仅用作缓存键
+    
+    返回:
+    tuple: (坐标系, 时间元组, 状态向量数组)
+    """
+    coord_system = "GCRS"  # 默认坐标系
+    
+    if filename.endswith('.npy'):
+        # 二进制星历（如 orbit_prediction_two_body 输出的 .npy 文件），无需解析文本
+        data = np.load(filename).reshape(-1, 8)
+    else:
+        # 从文件头注释中解析坐标系信息，并由第一行数据判断分隔符
+        delimiter = None
+        with open(filename, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    delimiter = ',' if ',' in line else None
+                    break
+                if line.startswith('# 坐标系:'):
+                    coord_system = line.split(':')[1].strip()
+        
+        with warnings.catch_warnings():
+            # 没有数据行的文件按空星历处理
+            warnings.simplefilter('ignore', UserWarning)
+            data = np.loadtxt(filename, comments='#', delimiter=delimiter, usecols=range(8), ndmin=2)
+    
+    # 一次性将全部MJD转换为datetime对象
+    mjd_total = data[:, 0] + data[:, 1] / 86400.0
+    times = tuple(Time(mjd_total, format='mjd').to_datetime()) if len(data) > 0 else ()
+    
+    data.setflags(write=False)
+    return coord_system, times, data[:, 2:8]
 
 
 class Satellite:
@@ -47,6 +198,8 @@ class Satellite:
         self.eph_coord = eph_coord  # 星历数据所处的坐标系
         
         # 惯性系星历数据存储（GCRS坐标系，字典格式）
+        # cartesian为(N, 6)数组，按列优先（Fortran顺序）存储：同一分量的数据在内存中连续，
+        # 只取位置列[:, :3]或速度列[:, 3:6]时读取的是连续内存
         if eph is not None:
             # 验证星历数据格式
             if not isinstance(eph, dict) or 'time' not in eph or 'cartesian' not in eph:
@@ -62,7 +215,7 @@ class Satellite:
             
             self.eph = {
                 'time': time_array,
-                'cartesian': np.array(eph['cartesian'])  # 转换为numpy数组
+                'cartesian': np.array(eph['cartesian'], order='F')  # 转换为numpy数组（列优先存储）
             }
         else:
             # 初始化空的惯性系星历数据
@@ -80,6 +233,40 @@ class Satellite:
         # 星下点数据存储（经纬度数组）
         # 每个元素为[经度, 纬度]，单位为度
         self.ground_track = []
+        
+        # 星历各时刻相对历元的秒数，用于按时间查询时二分查找
+        self._update_time_index()
+
+    def _update_time_index(self):
+        """
+        根据self.eph['time']重建时间索引（各时刻相对历元的秒数）
+        """
+        self._time_seconds = np.array([(t - self.epoch).total_seconds() for t in self.eph['time']])
+
+    def _interp_index(self, time):
+        """
+        查找指定时间所在的星历区间及线性插值系数（二分查找）
+        
+        参数:
+        time (datetime): 查询时间
+        
+        返回:
+        tuple: (i0, i1, alpha)，插值结果为 (1-alpha)*第i0点 + alpha*第i1点；
+               查询时间超出星历范围时取最近的端点
+        """
+        if len(self._time_seconds) != len(self.eph['time']):
+            # 星历被外部直接修改过，重新建立索引
+            self._update_time_index()
+        
+        t = self._time_seconds
+        if len(t) == 1:
+            return 0, 0, 0.0
+        
+        q = (time - self.epoch).total_seconds()
+        idx = min(max(int(np.searchsorted(t, q)), 1), len(t) - 1)
+        t0, t1 = t[idx - 1], t[idx]
+        alpha = (q - t0) / (t1 - t0) if t1 > t0 else 0.0
+        return idx - 1, idx, min(max(alpha, 0.0), 1.0)
 
     def propagate_orbit(self, start_time, end_time, time_step):
         """
@@ -112,33 +299,37 @@ class Satellite:
         # 清空星下点数据
         self.ground_track = []
         
-        # 计算时间范围
-        current_time = start_time
-        while current_time <= end_time:
-            # 计算当前时刻与历元的时间差（秒）
-            dt = (current_time - self.epoch).total_seconds()
-            
-            # 简单的二体模型计算（这里只是框架，实际的轨道计算会更复杂）
-            # 计算当前时刻的平近点角
-            n = np.sqrt(mu / self.kepler_elements['a']**3) * 180.0 / np.pi  # 平均运动
-            M = self.kepler_elements['M0'] + n * dt
-            
-            kpl = [self.kepler_elements['a'], self.kepler_elements['e'],
-                   self.kepler_elements['i'], self.kepler_elements['Omega'],
-                   self.kepler_elements['omega'], M]
-            
-            # 计算开普勒元素到笛卡尔坐标系的转换
-            cts = kpl2cts(np.array(kpl))
-
-            # 存储位置、速度和时间数据到星历
-            self.eph['time'].append(current_time)
-            self.eph['cartesian'].append(cts)  # cts包含[x,y,z,vx,vy,vz]
-            
-            # 更新时间
-            current_time += datetime.timedelta(seconds=time_step)
-        
-        # 将cartesian转换为numpy数组
-        self.eph['cartesian'] = np.array(self.eph['cartesian'])
+        # 时间序列：第k个时刻为 start_time + k*time_step，各时刻单独舍入到微秒，不累积舍入误差
+        one_us = datetime.timedelta(microseconds=1)
+        step_us = time_step * 1e6
+        span_us = (end_time - start_time) // one_us
+        num_steps = int(np.floor(span_us / step_us + 1e-9)) + 1 if span_us >= 0 else 0
+        step_offsets = np.rint(np.arange(num_steps) * step_us).astype(np.int64)
+        self.eph['time'] = [start_time + datetime.timedelta(microseconds=k) for k in step_offsets.tolist()]
+        
+        # 各时刻与历元的时间差（秒）
+        offset_us = (start_time - self.epoch) // one_us + step_offsets
+        dt = offset_us / 1e6
+        self._time_seconds = dt
+        
+        # 平均运动（度/秒）
+        a = float(self.kepler_elements['a'])
+        n = np.sqrt(mu / (a * a * a)) * 180.0 / np.pi
+        
+        e = float(self.kepler_elements['e'])
+        i = float(self.kepler_elements['i'])
+        Omega = float(self.kepler_elements['Omega'])
+        omega = float(self.kepler_elements['omega'])
+        M0 = float(self.kepler_elements['M0'])
+        
+        if NUMBA_AVAILABLE:
+            # 逐时刻计算开普勒元素到笛卡尔坐标系的转换，写入预分配数组
+            cartesian = np.empty((num_steps, 6), order='F')
+            _propagate_kernel(dt, a, e, i, Omega, omega, M0, float(n), cartesian)
+        else:
+            # 无numba时整体数组化：一次求出全部平近点角，批量求解开普勒方程
+            cartesian = np.asfortranarray(kpl2cts_soa(a, e, i, Omega, omega, M0 + n * dt))
+        self.eph['cartesian'] = cartesian  # 每行为[x,y,z,vx,vy,vz]
             
     def get_position_at_time(self, time):
         """
@@ -153,12 +344,12 @@ class Satellite:
         if len(self.eph['time']) == 0:
             return np.array([0, 0, 0])  # 没有星历数据时返回默认值
         
-        # 简单的最近邻插值
-        time_diffs = [abs((t - time).total_seconds()) for t in self.eph['time']]
-        min_index = np.argmin(time_diffs)
+        # 相邻两个时刻之间线性插值
+        i0, i1, alpha = self._interp_index(time)
+        cartesian = self.eph['cartesian']
         
         # 返回位置部分（前3个元素）
-        return self.eph['cartesian'][min_index][:3]
+        return (1.0 - alpha) * cartesian[i0, :3] + alpha * cartesian[i1, :3]
 
     def get_velocity_at_time(self, time):
         """
@@ -173,12 +364,12 @@ class Satellite:
         if len(self.eph['time']) == 0:
             return np.array([0, 0, 0])  # 没有星历数据时返回默认值
         
-        # 简单的最近邻插值
-        time_diffs = [abs((t - time).total_seconds()) for t in self.eph['time']]
-        min_index = np.argmin(time_diffs)
+        # 相邻两个时刻之间线性插值
+        i0, i1, alpha = self._interp_index(time)
+        cartesian = self.eph['cartesian']
         
         # 返回速度部分（后3个元素）
-        return self.eph['cartesian'][min_index][3:6]
+        return (1.0 - alpha) * cartesian[i0, 3:6] + alpha * cartesian[i1, 3:6]
 
     def save_ephemeris_data(self, filename):
         """
@@ -206,15 +397,12 @@ class Satellite:
                 f.write(f"# 数据点数: {len(self.eph['time'])}\n")
                 f.write("#\n")  # 分隔行
                 
-                # 写入数据
-                for time_obj, state_vector in zip(self.eph['time'], self.eph['cartesian']):
-                    mjd_total = self._datetime_to_mjd(time_obj)
-                    mjd_day = int(mjd_total)
-                    mjd_sec = (mjd_total - mjd_day) * 86400.0
-                    
-                    # 使用固定宽度格式化输出
-                    f.write(f"{mjd_day:8d} {mjd_sec:12.6f} {state_vector[0]:15.6f} {state_vector[1]:15.6f} "
-                           f"{state_vector[2]:15.6f} {state_vector[3]:15.6f} {state_vector[4]:15.6f} {state_vector[5]:15.6f}\n")
+                # 写入数据（一次性计算全部MJD，由numpy按固定宽度格式化输出）
+                mjd_total = self._datetimes_to_mjd(self.eph['time'])
+                mjd_day = mjd_total.astype(np.int64)
+                mjd_sec = (mjd_total - mjd_day) * 86400.0
+                data = np.column_stack([mjd_day, mjd_sec, np.asarray(self.eph['cartesian'], dtype=np.float64)[:, :6]])
+                np.savetxt(f, data, fmt="%8d %12.6f %15.6f %15.6f %15.6f %15.6f %15.6f %15.6f")
             
             print(f"卫星 {self.satellite_id} 星历数据已保存到 {filename}")
             
@@ -225,9 +413,11 @@ class Satellite:
         """
         从文本文件读取星历数据
         
-        文件格式: 固定宽度的空格分隔格式
+        文件格式: 固定宽度的空格分隔格式（也支持逗号分隔，或 .npy 二进制数组）
         MJD_day    MJD_sec    X(km)    Y(km)    Z(km)    VX(km/s)    VY(km/s)    VZ(km/s)
         
+        解析结果按文件路径和修改时间缓存，重复读取同一文件时不再重新解析
+        
         参数:
         filename (str): 星历数据文件路径
         """
@@ -238,47 +428,66 @@ class Satellite:
         # 清空星下点数据
         self.ground_track = []
         
+        try:
+            coord_system, times, cartesian = _load_ephemeris_file(filename, os.path.getmtime(filename))
+            self.eph['time'] = list(times)
+            self.eph['cartesian'] = np.array(cartesian, order='F') if len(times) > 0 else np.array([])
+            self.eph_coord = coord_system
+            self._update_time_index()
+            
+            print(f"成功读取卫星 {self.satellite_id} 的 {len(self.eph['time'])} 条星历数据")
+            return
+            
+        except FileNotFoundError:
+            print(f"错误: 找不到文件 {filename}")
+            return
+        except Exception:
+            # 文件中存在格式不正确的行等情况时，逐行解析并跳过这些行
+            pass
+        
         try:
             with open(filename, 'r') as f:
-                coord_system = "GCRS"  # 默认坐标系
+                lines = f.readlines()
+            
+            coord_system = "GCRS"  # 默认坐标系
+            
+            # 按行数预分配数组（行数是数据点数的上界），解析完成后截取有效部分
+            mjd = np.empty(len(lines))
+            cartesian = np.empty((len(lines), 6))
+            count = 0
+            
+            for line_num, line in enumerate(lines, 1):
+                line = line.strip()
                 
-                for line_num, line in enumerate(f, 1):
-                    line = line.strip()
-                    
-                    # 跳过空行和注释行，但解析坐标系信息
-                    if not line or line.startswith('#'):
-                        if line.startswith('# 坐标系:'):
-                            coord_system = line.split(':')[1].strip()
+                # 跳过空行和注释行，但解析坐标系信息
+                if not line or line.startswith('#'):
+                    if line.startswith('# 坐标系:'):
+                        coord_system = line.split(':')[1].strip()
+                    continue
+                
+                try:
+                    # 使用空格和/或逗号分隔数据
+                    parts = _EPH_SEPARATOR.split(line)
+                    if len(parts) < 8:  # 需要8个数据: MJD day, MJD sec, x, y, z, vx, vy, vz
+                        print(f"警告: 第{line_num}行数据格式不正确，跳过")
                         continue
                     
-                    try:
-                        # 使用空格分隔数据
-                        parts = line.split()
-                        if len(parts) < 8:  # 需要8个数据: MJD day, MJD sec, x, y, z, vx, vy, vz
-                            print(f"警告: 第{line_num}行数据格式不正确，跳过")
-                            continue
-                        
-                        # 解析MJD时间
-                        mjd_day = float(parts[0])
-                        mjd_sec = float(parts[1])
-                        mjd_total = mjd_day + mjd_sec / 86400.0  # 转换为完整的MJD
-                        
-                        # 转换MJD到datetime对象
-                        time_obj = self._mjd_to_datetime(mjd_total)
-                        
-                        # 解析状态向量数据
-                        state_vector = [float(x) for x in parts[2:8]]  # x, y, z, vx, vy, vz
-                        
-                        self.eph['time'].append(time_obj)
-                        self.eph['cartesian'].append(state_vector)
-                        
-                    except (ValueError, IndexError) as e:
-                        print(f"警告: 第{line_num}行数据解析错误: {e}")
-                        continue
+                    # 解析MJD时间和状态向量数据（x, y, z, vx, vy, vz）
+                    mjd_total = float(parts[0]) + float(parts[1]) / 86400.0  # 转换为完整的MJD
+                    cartesian[count] = [float(x) for x in parts[2:8]]
+                    mjd[count] = mjd_total
+                    count += 1
+                    
+                except (ValueError, IndexError) as e:
+                    print(f"警告: 第{line_num}行数据解析错误: {e}")
+                    continue
             
-            # 将cartesian转换为numpy数组
-            self.eph['cartesian'] = np.array(self.eph['cartesian'])
+            # 一次性将全部MJD转换为datetime对象
+            if count > 0:
+                self.eph['time'] = list(Time(mjd[:count], format='mjd').to_datetime())
+            self.eph['cartesian'] = np.array(cartesian[:count], order='F') if count > 0 else np.array([])
             self.eph_coord = coord_system
+            self._update_time_index()
             
             print(f"成功读取卫星 {self.satellite_id} 的 {len(self.eph['time'])} 条星历数据")
             
@@ -298,8 +507,7 @@ class Satellite:
         float: 对应的MJD
         """
         try:
-            from astropy.time import Time
-            astropy_time = Time(dt.isoformat())
+            astropy_time = Time(dt)
             return astropy_time.mjd
         except:
             # 简化计算方法（备用）
@@ -307,6 +515,23 @@ class Satellite:
             delta = dt - epoch
             return delta.total_seconds() / 86400.0
 
+    def _datetimes_to_mjd(self, times):
+        """
+        将一组datetime对象批量转换为修正儒略日(MJD)
+        
+        参数:
+        times (list): datetime对象列表
+        
+        返回:
+        np.array: 对应的MJD数组
+        """
+        try:
+            return np.asarray(datetimes_to_time(times).mjd, dtype=np.float64)
+        except Exception:
+            # 简化计算方法（备用）
+            epoch = datetime.datetime(1858, 11, 17)  # MJD起始时间
+            return np.array([(t - epoch).total_seconds() / 86400.0 for t in times])
+
     def _mjd_to_datetime(self, mjd):
         """
         将修正儒略日(MJD)转换为datetime对象
@@ -327,15 +552,20 @@ class Satellite:
             delta = datetime.timedelta(days=mjd)
             return epoch + delta
 
-    def eph_GCRS2ITRF(self):
+    def eph_GCRS2ITRF(self, interp_interval=300.0):
         """
         将GCRS坐标系下的惯性系星历转换到ITRF坐标系，存储为地固系星历
         
         该方法会将self.eph中的惯性系星历数据转换后存储到self.eph_itrf中
         
+        参数:
+        interp_interval (float): 岁差章动矩阵的插值间隔（秒），默认300秒；
+                                 为None时按astropy坐标框架逐时刻转换
+        
         注意:
         - 只有当前坐标系为GCRS时才进行转换
         - 转换后的地固系星历存储在eph_itrf中
+        - eph_itrf['time']与eph['time']是同一个列表，不应原地修改
         - 原有的惯性系星历保持不变
         - 需要安装astropy库
         
@@ -349,68 +579,36 @@ class Satellite:
             print("警告: 惯性系星历数据为空，无法进行坐标系转换")
             return
         
-        # 转换星历数据
-        converted_cartesian = []
-        
-        for i, (time_point, state_vector) in enumerate(zip(self.eph['time'], self.eph['cartesian'])):
-            try:
-                # 提取位置和速度 (km, km/s)
-                position = state_vector[:3]  # [x, y, z]
-                velocity = state_vector[3:6]  # [vx, vy, vz]
-                
-                # 转换datetime到astropy Time对象
-                astropy_time = Time(time_point.isoformat())
-                
-                # 创建GCRS坐标对象（位置）
-                gcrs_pos = GCRS(
-                    CartesianRepresentation(
-                        x=position[0] * u.km,
-                        y=position[1] * u.km,
-                        z=position[2] * u.km
-                    ),
-                    obstime=astropy_time
-                )
-                
-                # 创建GCRS坐标对象（速度）
-                gcrs_vel = GCRS(
-                    CartesianRepresentation(
-                        x=velocity[0] * u.km / u.s,
-                        y=velocity[1] * u.km / u.s,
-                        z=velocity[2] * u.km / u.s
-                    ),
-                    obstime=astropy_time
-                )
-                
-                # 转换到ITRS坐标系
-                itrs_pos = gcrs_pos.transform_to(ITRS(obstime=astropy_time))
-                itrs_vel = gcrs_vel.transform_to(ITRS(obstime=astropy_time))
-                
-                # 提取转换后的坐标值
-                converted_position = [
-                    itrs_pos.cartesian.x.to(u.km).value,
-                    itrs_pos.cartesian.y.to(u.km).value,
-                    itrs_pos.cartesian.z.to(u.km).value
-                ]
+        # 所有时刻一次性转换：一个Time数组、一个带速度微分的GCRS坐标对象
+        cartesian = np.asarray(self.eph['cartesian'], dtype=np.float64)
+        try:
+            if interp_interval is not None:
+                # 直接组合ERFA旋转矩阵，岁差章动矩阵按间隔插值
+                converted_cartesian = _gcrs_to_itrs_states(self.eph['time'], cartesian, interp_interval)
+            else:
+                times = datetimes_to_time(self.eph['time'])
                 
-                converted_velocity = [
-                    itrs_vel.cartesian.x.to(u.km/u.s).value,
-                    itrs_vel.cartesian.y.to(u.km/u.s).value,
-                    itrs_vel.cartesian.z.to(u.km/u.s).value
-                ]
+                # 位置、速度以(3, N)视图直接带单位构造，不复制星历数组
+                vel = CartesianDifferential(cartesian[:, 3:6].T, unit=u.km / u.s, copy=False)
+                rep = CartesianRepresentation(cartesian[:, :3].T, unit=u.km, differentials=vel, copy=False)
                 
-                # 组合位置和速度
-                converted_state = converted_position + converted_velocity
-                converted_cartesian.append(converted_state)
+                # 转换到ITRS坐标系（速度按地固系速度转换，包含地球自转的影响）
+                itrs = GCRS(rep, obstime=times).transform_to(ITRS(obstime=times))
                 
-            except Exception as e:
-                print(f"转换第{i}个时刻的坐标时出错: {e}")
-                # 如果转换失败，保持原坐标
-                converted_cartesian.append(state_vector)
+                converted_cartesian = np.asfortranarray(np.hstack([
+                    itrs.cartesian.xyz.to(u.km).value.T,
+                    itrs.cartesian.differentials['s'].d_xyz.to(u.km / u.s).value.T
+                ]))
+            
+        except Exception as e:
+            print(f"GCRS到ITRF坐标转换出错: {e}")
+            # 如果转换失败，保持原坐标
+            converted_cartesian = np.array(cartesian, order='F')
         
-        # 更新地固系星历数据
+        # 更新地固系星历数据（时间序列与惯性系星历相同，直接共用同一个列表）
         self.eph_itrf = {
-            'time': self.eph['time'].copy(),  # 复制时间数组
-            'cartesian': np.array(converted_cartesian)
+            'time': self.eph['time'],
+            'cartesian': converted_cartesian
         }
         
         print(f"成功将{len(converted_cartesian)}个时刻的星历从GCRS转换到ITRF坐标系")
@@ -460,7 +658,10 @@ class Satellite:
         bool: 是否成功获得地固系星历数据
         """
         if self.has_itrf_ephemeris():
-            return True
+            # 地固系星历由当前惯性系星历转换得到时直接复用；惯性系星历被整体替换后重新转换
+            if (self.eph_itrf['time'] is self.eph['time'] or self.eph_coord != "GCRS"
+                    or len(self.eph['time']) == 0):
+                return True
         
         if len(self.eph['time']) == 0:
             print("警告: 没有惯性系星历数据，无法生成地固系星历")
@@ -474,16 +675,21 @@ class Satellite:
             print(f"警告: 当前惯性系星历坐标系为{self.eph_coord}，无法自动转换到ITRF")
             return False
 
-    def calculate_ground_track(self):
+    def calculate_ground_track(self, use_geodetic=True):
         """
         计算卫星的星下点轨迹
         
         该方法使用地固系星历（ITRF坐标系）计算星下点轨迹。
         如果没有地固系星历，会自动从惯性系星历转换。
+        所有时刻一次性批量计算。
+        
+        参数:
+        use_geodetic (bool): 为True时用astropy计算WGS84大地经纬度（默认）；
+                             为False时用球面地心经纬度，纬度最大相差约0.2度
         
         返回:
-        list: 星下点轨迹，每个元素为[经度, 纬度]，单位为度
-              经度范围: [-180, 180]
+        ndarray: 星下点轨迹，形状(N, 2)，每行为[经度, 纬度]，单位为度
+              经度范围: [-180, 180)
               纬度范围: [-90, 90]
         """
         # 确保有地固系星历数据
@@ -492,75 +698,50 @@ class Satellite:
             self.ground_track = []
             return self.ground_track
         
-        # 清空之前的星下点数据
-        self.ground_track = []
+        # ITRF坐标系下的位置 (km)
+        positions = np.asarray(self.eph_itrf['cartesian'], dtype=np.float64)[:, :3]
         
-        # 使用地固系星历计算每个时刻的星下点
-        for i, (time_point, state_vector) in enumerate(zip(self.eph_itrf['time'], self.eph_itrf['cartesian'])):
+        longitude = latitude = None
+        if use_geodetic:
+            # 方法1: 使用astropy进行精确转换（一次批量调用）
             try:
-                # 提取ITRF坐标系下的位置 (km)
-                position = state_vector[:3]  # [x, y, z]
-                
-                # 方法1: 使用astropy进行精确转换
-                try:
-                    # 转换datetime到astropy Time对象
-                    astropy_time = Time(time_point.isoformat())
-                    
-                    # 创建ITRS坐标对象
-                    itrs_coord = ITRS(
-                        CartesianRepresentation(
-                            x=position[0] * u.km,
-                            y=position[1] * u.km,
-                            z=position[2] * u.km
-                        ),
-                        obstime=astropy_time
-                    )
-                    
-                    # 转换为地理坐标
-                    geo_coord = itrs_coord.earth_location
-                    longitude = geo_coord.lon.deg  # 经度（度）
-                    latitude = geo_coord.lat.deg   # 纬度（度）
-                    
-                except Exception as astropy_error:
-                    print(f"Astropy转换失败，使用简化方法: {astropy_error}")
-                    # 方法2: 使用简化的球面坐标转换（备用方法）
-                    longitude, latitude = self._cartesian_to_lonlat_simple(position)
-                
-                # 确保经度在[-180, 180]范围内
-                while longitude > 180:
-                    longitude -= 360
-                while longitude < -180:
-                    longitude += 360
-                
-                # 添加到星下点轨迹
-                self.ground_track.append([longitude, latitude])
-                
-            except Exception as e:
-                print(f"计算第{i}个时刻的星下点时出错: {e}")
-                # 如果计算失败，添加默认值
-                self.ground_track.append([0.0, 0.0])
+                geo_coord = EarthLocation.from_geocentric(
+                    positions[:, 0] * u.km, positions[:, 1] * u.km, positions[:, 2] * u.km)
+                longitude = geo_coord.lon.deg  # 经度（度）
+                latitude = geo_coord.lat.deg   # 纬度（度）
+            except Exception as astropy_error:
+                print(f"Astropy转换失败，使用简化方法: {astropy_error}")
+        
+        if longitude is None:
+            # 方法2: 使用简化的球面坐标转换
+            longitude, latitude = self._cartesian_to_lonlat_vec(positions)
+        
+        # 确保经度在[-180, 180)范围内
+        longitude = (longitude + 180.0) % 360.0 - 180.0
+        
+        self.ground_track = np.column_stack([longitude, latitude])
         
         print(f"成功计算{len(self.ground_track)}个时刻的星下点")
         return self.ground_track
 
-    def _cartesian_to_lonlat_simple(self, position):
+    def _cartesian_to_lonlat_vec(self, positions):
         """
-        简化的笛卡尔坐标到经纬度转换（备用方法）
+        简化的笛卡尔坐标到经纬度转换（球面地心经纬度，批量计算）
         
         参数:
-        position (array): ITRF坐标系下的位置 [x, y, z] (km)
+        positions (ndarray): ITRF坐标系下的位置，形状(N, 3) (km)
         
         返回:
-        tuple: (经度, 纬度) 单位为度
+        tuple: (经度数组, 纬度数组) 单位为度
         """
-        x, y, z = position
+        x, y, z = positions[:, 0], positions[:, 1], positions[:, 2]
         
         # 计算经度
-        longitude = np.arctan2(y, x) * 180.0 / np.pi
+        longitude = np.degrees(np.arctan2(y, x))
         
         # 计算纬度
-        r = np.sqrt(x**2 + y**2 + z**2)
-        latitude = np.arcsin(z / r) * 180.0 / np.pi
+        r = np.sqrt(x * x + y * y + z * z)
+        latitude = np.degrees(np.arcsin(z / r))
         
         return longitude, latitude
 
@@ -569,7 +750,7 @@ class Satellite:
         获取星下点轨迹
         
         返回:
-        list: 星下点轨迹，每个元素为[经度, 纬度]，单位为度
+        ndarray: 星下点轨迹，形状(N, 2)，每行为[经度, 纬度]，单位为度
         """
         if len(self.ground_track) == 0:
             # 如果没有计算过星下点轨迹，尝试计算
@@ -590,8 +771,14 @@ class Satellite:
         if len(self.ground_track) == 0 or len(self.eph['time']) == 0:
             return [0.0, 0.0]
         
-        # 简单的最近邻插值
-        time_diffs = [abs((t - time).total_seconds()) for t in self.eph['time']]
-        min_index = np.argmin(time_diffs)
+        # 相邻两个时刻之间线性插值
+        i0, i1, alpha = self._interp_index(time)
+        lon0, lat0 = self.ground_track[i0]
+        lon1, lat1 = self.ground_track[i1]
+        
+        # 经度按最短方向插值，跨越±180°时不会绕行整个地球
+        dlon = (lon1 - lon0 + 180.0) % 360.0 - 180.0
+        longitude = (lon0 + alpha * dlon + 180.0) % 360.0 - 180.0
+        latitude = lat0 + alpha * (lat1 - lat0)
         
-        return self.ground_track[min_index]
\ No newline at end of file
+        return [float(longitude), float(latitude)]
\ No newline at end of file
@@ -1,4 +1,6 @@
 import numpy as np
+from astropy.coordinates import EarthLocation
+import astropy.units as u
 
 
 class GroundStation:
@@ -22,37 +24,113 @@ class GroundStation:
         self.latitude = latitude
         self.altitude = altitude
         
+        # 预先计算ECEF坐标和天顶方向单位向量，可见性判断时无需再计算三角函数
+        self._update_geocentric()
+        
+        # astropy位置对象（WGS84椭球），首次用于观测计算时创建
+        self._earth_location = None
+        self._earth_location_key = None
+    
+    def _update_geocentric(self):
+        """
+        根据当前经纬度和海拔计算并缓存ECEF坐标和天顶方向单位向量
+        """
+        lon_rad = np.radians(self.longitude)
+        lat_rad = np.radians(self.latitude)
+        cos_lat = np.cos(lat_rad)
+        
+        self._up = np.array([cos_lat * np.cos(lon_rad), cos_lat * np.sin(lon_rad), np.sin(lat_rad)])
+        self._ecef = GroundStation.batch_ecef([self])[0]
+        self._up.setflags(write=False)
+        self._ecef.setflags(write=False)
+        self._geocentric_key = (self.longitude, self.latitude, self.altitude)
+    
+    def _geocentric(self):
+        """
+        获取缓存的(ECEF坐标, 天顶方向单位向量)，地面站位置被修改过时重新计算
+        """
+        if self._geocentric_key != (self.longitude, self.latitude, self.altitude):
+            self._update_geocentric()
+        return self._ecef, self._up
+        
     def get_ECEF_coordinates(self):
         """
         获取地面站的地心固连坐标系（ECEF）坐标
         
+        坐标按(经度, 纬度, 海拔)缓存，位置不变时重复调用不再重新计算
+        
+        返回:
+        np.array: 地面站的ECEF坐标 [x, y, z]（只读）
+        """
+        return self._geocentric()[0]
+    
+    def get_earth_location(self):
+        """
+        获取地面站的astropy EarthLocation对象（WGS84椭球）及其地心坐标
+        
+        按(经度, 纬度, 海拔)缓存，位置不变时多次观测计算共享同一对象，
+        地面站的ITRS位置不随时间变化，只需计算一次
+        
         返回:
-        np.array: 地面站的ECEF坐标 [x, y, z]
+        tuple: (EarthLocation, np.array) 地面站位置对象和地心坐标 [x, y, z]（km，只读）
+        """
+        key = (self.longitude, self.latitude, self.altitude)
+        if self._earth_location_key != key:
+            location = EarthLocation(
+                lon=self.longitude * u.deg,
+                lat=self.latitude * u.deg,
+                height=self.altitude * u.m
+            )
+            position = np.array([c.to_value(u.km) for c in location.geocentric])
+            position.setflags(write=False)
+            self._earth_location = (location, position)
+            self._earth_location_key = key
+        return self._earth_location
+    
+    @staticmethod
+    def batch_ecef(stations):
+        """
+        批量计算多个地面站的ECEF坐标
+        
+        参数:
+        stations (list): GroundStation对象列表
+        
+        返回:
+        np.array: 形状(N, 3)的ECEF坐标数组，每行为[x, y, z]（km）
         """
         # 地球半径（km）
         R_earth = 6378.137
         
         # 将经纬度转换为弧度
-        lon_rad = np.radians(self.longitude)
-        lat_rad = np.radians(self.latitude)
+        lon_rad = np.radians(np.array([station.longitude for station in stations], dtype=np.float64))
+        lat_rad = np.radians(np.array([station.latitude for station in stations], dtype=np.float64))
+        alt = np.array([station.altitude for station in stations], dtype=np.float64)
         
         # 计算ECEF坐标
-        x = (R_earth + self.altitude/1000) * np.cos(lat_rad) * np.cos(lon_rad)
-        y = (R_earth + self.altitude/1000) * np.cos(lat_rad) * np.sin(lon_rad)
-        z = (R_earth + self.altitude/1000) * np.sin(lat_rad)
-        
-        return np.array([x, y, z])
+        r_cos_lat = (R_earth + alt/1000) * np.cos(lat_rad)
+        return np.column_stack([
+            r_cos_lat * np.cos(lon_rad),
+            r_cos_lat * np.sin(lon_rad),
+            (R_earth + alt/1000) * np.sin(lat_rad),
+        ])
     
     def check_visibility(self, satellite_position, elevation_mask=10):
         """
-        检查卫星是否对地面站可见
+        检查卫星是否对地面站可见（以地心方向为天顶的球面仰角）
         
         参数:
-        satellite_position (np.array): 卫星在ECEF坐标系中的位置 [x, y, z]
+        satellite_position (np.array): 卫星在ECEF坐标系中的位置 [x, y, z]，
+                                       或形状(N, 3)的位置数组（km）
         elevation_mask (float): 最小仰角（度）
         
         返回:
-        bool: 是否可见
+        bool: 是否可见；输入为(N, 3)数组时返回形状(N,)的布尔数组
         """
-        # 需要实现可见性检查逻辑
-        return False  # 框架中返回默认值
\ No newline at end of file
+        station, up = self._geocentric()
+        
+        rho = np.asarray(satellite_position, dtype=np.float64) - station
+        rho_norm = np.sqrt(np.sum(rho * rho, axis=-1))
+        
+        # 仰角 > 截止角 等价于 视线方向·天顶方向 > sin(截止角)*距离，逐点无需三角函数
+        visible = rho @ up > np.sin(np.radians(elevation_mask)) * rho_norm
+        return bool(visible) if visible.ndim == 0 else visible
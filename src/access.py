@@ -1,10 +1,81 @@
+import contextlib
+import math
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import datetime
-from astropy.time import Time
-from astropy.coordinates import ITRS, EarthLocation, AltAz, GCRS, CartesianRepresentation
+from astropy.coordinates import ITRS, AltAz, CIRS, GCRS, CartesianRepresentation
 from astropy import units as u
 import astropy.coordinates as coord
+from astropy.coordinates.erfa_astrom import erfa_astrom, ErfaAstromInterpolator
+from src.dateMJD import datetimes_to_datetime64, datetimes_to_time
 
+# 几何仰角预筛选的余量（度）。几何仰角与astropy地平坐标仰角的差异主要来自astropy
+# 经CIRS中转时加入的光行差修正，对轨道高度200 km以上的卫星不超过约0.1度，远小于该值，
+# 因此只跳过必然低于仰角限制的时刻，观测结果不变
+ELEVATION_PREFILTER_MARGIN = 0.5
+
+# 修正儒略日(MJD)的起点 1858-11-17 00:00:00 UTC
+_MJD_EPOCH = datetime.datetime(1858, 11, 17)
+_MJD_EPOCH_US = np.datetime64('1858-11-17', 'us')
+
+
+def _mjd_to_datetimes(mjd_day, mjd_sec):
+    """
+    将MJD天数和天内秒数数组批量转换为datetime对象列表（精确到微秒）
+    
+    参数:
+    mjd_day (np.array): MJD整数天
+    mjd_sec (np.array): 天内秒数
+    
+    返回:
+    list: datetime对象列表
+    """
+    offset_us = np.rint(mjd_day * 86400e6 + mjd_sec * 1e6).astype(np.int64)
+    return (_MJD_EPOCH_US + offset_us.astype('timedelta64[us]')).tolist()
+
+
+def _topocentric_azel(rho, longitude, latitude):
+    """
+    将站心ITRF矢量转换为方位角和俯仰角（方位角由北向东起算，不含大气折射）
+    
+    参数:
+    rho (np.array): 形状(N, 3)的站心矢量（卫星位置减地面站位置，km）
+    longitude (float): 地面站经度（度）
+    latitude (float): 地面站大地纬度（度）
+    
+    返回:
+    tuple: (方位角数组, 俯仰角数组)，单位度
+    """
+    lon_rad = math.radians(longitude)
+    lat_rad = math.radians(latitude)
+    sin_lon, cos_lon = math.sin(lon_rad), math.cos(lon_rad)
+    sin_lat, cos_lat = math.sin(lat_rad), math.cos(lat_rad)
+    
+    # 行依次为东、北、天顶方向单位矢量
+    enu = np.array([[-sin_lon, cos_lon, 0.0],
+                    [-sin_lat * cos_lon, -sin_lat * sin_lon, cos_lat],
+                    [cos_lat * cos_lon, cos_lat * sin_lon, sin_lat]])
+    east, north, up = (rho @ enu.T).T
+    
+    azimuth = np.degrees(np.arctan2(east, north)) % 360.0
+    elevation = np.degrees(np.arctan2(up, np.hypot(east, north)))
+    return azimuth, elevation
+
+
+def _datetimes_to_mjd(times):
+    """
+    将datetime对象序列批量转换为MJD数组
+    
+    参数:
+    times (list): datetime对象列表
+    
+    返回:
+    np.array: MJD数组(float64)
+    """
+    offset = np.array(times, dtype='datetime64[us]') - _MJD_EPOCH_US
+    return offset / np.timedelta64(86400, 's')
 
 class Access:
     """
@@ -14,7 +85,7 @@ class Access:
     赤经赤纬、测距测速等不同类型的观测数据。
     """
     
-    def __init__(self, station_id, satellite_id, obs_type='Azi_Ele'):
+    def __init__(self, station_id, satellite_id, obs_type='Azi_Ele', astrom_resolution=300 * u.s):
         """
         初始化观测对象
         
@@ -25,14 +96,17 @@ class Access:
                        'Azi_Ele': 方位角俯仰角 [azimuth(deg), elevation(deg)]
                        'RA_DEC': 赤经赤纬 [ra(deg), dec(deg)]
                        'R_RD': 测距测速 [range(km), range_rate(km/s)]
+        astrom_resolution (Quantity): 坐标转换中ERFA天体测量参数的插值间隔，默认300秒；
+                                      为None时逐时刻精确计算
         """
         self.station_id = station_id
         self.satellite_id = satellite_id
         self.obs_type = obs_type
+        self.astrom_resolution = astrom_resolution
         
         # 观测数据存储
-        self.times = []  # datetime对象列表
-        self.data = []   # 观测数据列表，每个元素根据obs_type包含不同数量的数值
+        self.times = np.empty(0, dtype=np.float64)  # 观测时刻的MJD数组，需要datetime时使用times_as_datetime()
+        self.data = self._empty_data()  # 观测数据数组，形状(N, 数据长度)，每行含义由obs_type决定
         
         # 验证观测类型
         valid_types = ['Azi_Ele', 'RA_DEC', 'R_RD']
@@ -49,49 +123,58 @@ class Access:
         参数:
         filename (str): 观测数据文件路径
         """
-        self.times = []
-        self.data = []
+        self.times = np.empty(0, dtype=np.float64)
+        self.data = self._empty_data()
+        
+        # 快速路径：整个文件交给numpy一次解析
+        arr = self._load_observation_array(filename)
+        if arr is not None:
+            self.times = arr[:, 0] + arr[:, 1] / 86400.0
+            self.data = np.ascontiguousarray(arr[:, 2:])
+            print(f"成功读取{len(self.times)}条观测数据")
+            return
         
+        # 文件中存在格式不正确的行时，逐行解析并跳过错误行
+        times = []
+        data = []
+        expected_length = self._get_expected_data_length()
         try:
+            # 整个文件一次读入后再按行拆分
             with open(filename, 'r') as f:
-                for line_num, line in enumerate(f, 1):
-                    line = line.strip()
-                    
-                    # 跳过空行和注释行
-                    if not line or line.startswith('#'):
+                lines = f.read().splitlines()
+            
+            # 跳过空行和注释行，其余行按空格分隔，保留行号用于提示
+            records = [(line_num, line.split()) for line_num, line in enumerate(lines, 1)
+                       if line.strip() and not line.lstrip().startswith('#')]
+            
+            for line_num, parts in records:
+                try:
+                    if len(parts) < 3:  # 至少需要MJD day, MJD sec, 一个数据
+                        print(f"警告: 第{line_num}行数据格式不正确，跳过")
                         continue
                     
-                    try:
-                        # 使用空格分隔数据
-                        parts = line.split()
-                        if len(parts) < 3:  # 至少需要MJD day, MJD sec, 一个数据
-                            print(f"警告: 第{line_num}行数据格式不正确，跳过")
-                            continue
-                        
-                        # 解析MJD时间
-                        mjd_day = float(parts[0])
-                        mjd_sec = float(parts[1])
-                        mjd_total = mjd_day + mjd_sec / 86400.0  # 转换为完整的MJD
-                        
-                        # 转换MJD到datetime对象
-                        time_obj = self._mjd_to_datetime(mjd_total)
-                        
-                        # 解析观测数据
-                        obs_data = [float(x) for x in parts[2:]]
-                        
-                        # 验证数据长度
-                        expected_length = self._get_expected_data_length()
-                        if len(obs_data) != expected_length:
-                            print(f"警告: 第{line_num}行数据长度不匹配，期望{expected_length}个数据，实际{len(obs_data)}个")
-                            continue
-                        
-                        self.times.append(time_obj)
-                        self.data.append(obs_data)
-                        
-                    except (ValueError, IndexError) as e:
-                        print(f"警告: 第{line_num}行数据解析错误: {e}")
+                    # 解析MJD时间
+                    mjd_day = float(parts[0])
+                    mjd_sec = float(parts[1])
+                    mjd_total = mjd_day + mjd_sec / 86400.0  # 转换为完整的MJD
+                    
+                    # 解析观测数据
+                    obs_data = [float(x) for x in parts[2:]]
+                    
+                    # 验证数据长度
+                    if len(obs_data) != expected_length:
+                        print(f"警告: 第{line_num}行数据长度不匹配，期望{expected_length}个数据，实际{len(obs_data)}个")
                         continue
+                    
+                    times.append(mjd_total)
+                    data.append(obs_data)
+                    
+                except (ValueError, IndexError) as e:
+                    print(f"警告: 第{line_num}行数据解析错误: {e}")
+                    continue
             
+            self.times = np.array(times, dtype=np.float64)
+            self.data = np.array(data, dtype=np.float64).reshape(len(times), expected_length)
             print(f"成功读取{len(self.times)}条观测数据")
             
         except FileNotFoundError:
@@ -99,6 +182,27 @@ class Access:
         except Exception as e:
             print(f"读取文件时发生错误: {e}")
     
+    def _load_observation_array(self, filename):
+        """
+        用np.loadtxt一次读入观测数据文件
+        
+        参数:
+        filename (str): 观测数据文件路径
+        
+        返回:
+        np.array: 形状(N, 2+数据长度)的数组；文件无法整体解析或列数不匹配时返回None
+        """
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')  # 空文件时loadtxt会给出警告
+                arr = np.loadtxt(filename, comments='#', ndmin=2, encoding='utf-8')
+        except (OSError, ValueError):
+            return None
+        
+        if arr.shape[0] == 0 or arr.shape[1] != 2 + self._get_expected_data_length():
+            return None
+        return arr
+    
     def save_observation_data(self, filename):
         """
         保存观测数据到文本文件
@@ -113,51 +217,59 @@ class Access:
             print("警告: 没有观测数据可保存")
             return
         
+        columns = {
+            'Azi_Ele': ("Azimuth(deg)    Elevation(deg)", 'Azimuth', 'Elevation'),
+            'RA_DEC': ("RA(deg)         DEC(deg)", 'RA', 'DEC'),
+            'R_RD': ("Range(km)       Range_Rate(km/s)", 'Range', 'Range_Rate'),
+        }
+        
         try:
-            with open(filename, 'w') as f:
-                # 写入文件头
-                f.write(f"# 观测数据文件\n")
-                f.write(f"# 观测站编号: {self.station_id}\n")
-                f.write(f"# 卫星编号: {self.satellite_id}\n")
-                f.write(f"# 观测类型: {self.obs_type}\n")
-                f.write(f"# 格式: 固定宽度空格分隔\n")
-                f.write(f"# 列说明: MJD_Day    MJD_Sec         ")
-                
-                if self.obs_type == 'Azi_Ele':
-                    f.write("Azimuth(deg)    Elevation(deg)\n")
-                    header = f"# {'MJD_Day':>8} {'MJD_Sec':>12} {'Azimuth':>12} {'Elevation':>12}\n"
-                elif self.obs_type == 'RA_DEC':
-                    f.write("RA(deg)         DEC(deg)\n")
-                    header = f"# {'MJD_Day':>8} {'MJD_Sec':>12} {'RA':>12} {'DEC':>12}\n"
-                elif self.obs_type == 'R_RD':
-                    f.write("Range(km)       Range_Rate(km/s)\n")
-                    header = f"# {'MJD_Day':>8} {'MJD_Sec':>12} {'Range':>12} {'Range_Rate':>12}\n"
-                
-                f.write(header)
-                f.write(f"# 数据点数: {len(self.times)}\n")
-                f.write("#\n")  # 分隔行
-                
-                # 写入数据
-                for time_obj, obs_data in zip(self.times, self.data):
-                    mjd_total = self._datetime_to_mjd(time_obj)
-                    mjd_day = int(mjd_total)
-                    mjd_sec = (mjd_total - mjd_day) * 86400.0
-                    
-                    # 使用固定宽度格式化输出
-                    if len(obs_data) == 2:
-                        f.write(f"{mjd_day:8d} {mjd_sec:12.6f} {obs_data[0]:12.6f} {obs_data[1]:12.6f}\n")
-                    else:
-                        # 处理其他数据长度
-                        data_str = ' '.join([f"{x:12.6f}" for x in obs_data])
-                        f.write(f"{mjd_day:8d} {mjd_sec:12.6f} {data_str}\n")
+            description, name1, name2 = columns[self.obs_type]
+            
+            # 文件头拼接为一个字符串，一次写入
+            header = "".join([
+                "# 观测数据文件\n",
+                f"# 观测站编号: {self.station_id}\n",
+                f"# 卫星编号: {self.satellite_id}\n",
+                f"# 观测类型: {self.obs_type}\n",
+                "# 格式: 固定宽度空格分隔\n",
+                f"# 列说明: MJD_Day    MJD_Sec         {description}\n",
+                f"# {'MJD_Day':>8} {'MJD_Sec':>12} {name1:>12} {name2:>12}\n",
+                f"# 数据点数: {len(self.times)}\n",
+                "#\n",  # 分隔行
+            ])
+            
+            # 数据块：所有记录组成一个数组，按固定宽度格式一次格式化为一个字符串
+            data_arr = np.asarray(self.data, dtype=np.float64).reshape(len(self.times), -1)
+            mjd_days = self.times.astype(np.int64)
+            mjd_secs = (self.times - mjd_days) * 86400.0
+            out = np.column_stack([mjd_days, mjd_secs, data_arr])
+            row_format = "%8d %12.6f" + " %12.6f" * data_arr.shape[1] + "\n"
+            body = (row_format * len(out)) % tuple(out.ravel().tolist())
+            
+            # 以二进制方式写入预先编码的字节，大缓冲区下只需少量系统调用
+            with open(filename, 'wb', buffering=1 << 20) as f:
+                f.write(header.encode('utf-8'))
+                f.write(body.encode('utf-8'))
             
             print(f"观测数据已保存到 {filename}")
             
         except Exception as e:
             print(f"保存文件时发生错误: {e}")
     
+    def _astrom_context(self):
+        """
+        返回坐标转换使用的ERFA天体测量参数上下文
+        
+        缓慢变化的参数（岁差章动、地球位置速度等）在astrom_resolution间隔的粗网格上计算后插值，
+        astrom_resolution为None时返回空上下文，逐时刻精确计算
+        """
+        if self.astrom_resolution is None:
+            return contextlib.nullcontext()
+        return erfa_astrom.set(ErfaAstromInterpolator(self.astrom_resolution))
+    
     def calculate_observation_data(self, scenario, start_time=None, end_time=None, 
-                                 time_step=None, elevation_mask=10.0):
+                                 time_step=None, elevation_mask=10.0, fast=False):
         """
         计算观测数据
         
@@ -167,6 +279,9 @@ class Access:
         end_time (datetime): 结束时间，默认使用场景时间
         time_step (float): 时间步长（秒），默认使用场景步长
         elevation_mask (float): 最小仰角限制（度），默认10度
+        fast (bool): 为True时将站心矢量直接旋转到地平坐标系计算方位角俯仰角，不经过astropy的CIRS中转；
+                     结果与astropy对站心ITRS坐标的直接转换一致，但不含光行差修正，
+                     与默认方法相差可达百角秒量级。默认False
         """
         # 使用场景的时间参数
         start_time = start_time or scenario.start_time
@@ -202,96 +317,111 @@ class Access:
             print(f"错误: 卫星 {self.satellite_id} 无法获得地固系星历数据")
             return
         
-        # 创建地面站的EarthLocation对象
-        station_location = EarthLocation(
-            lon=ground_station.longitude * u.deg,
-            lat=ground_station.latitude * u.deg,
-            height=ground_station.altitude * u.m
-        )
+        # 地面站的EarthLocation对象及ITRF坐标（由地面站缓存，不随时间变化）
+        station_location, station_pos = ground_station.get_earth_location()
+        
+        # 地面站天顶方向单位矢量（大地法线）及几何仰角筛选阈值
+        lat_rad = math.radians(ground_station.latitude)
+        lon_rad = math.radians(ground_station.longitude)
+        zenith = np.array([math.cos(lat_rad) * math.cos(lon_rad),
+                           math.cos(lat_rad) * math.sin(lon_rad),
+                           math.sin(lat_rad)])
+        sin_ele_cut = math.sin(math.radians(max(elevation_mask - ELEVATION_PREFILTER_MARGIN, -90.0)))
         
         # 清空现有数据
-        self.times = []
-        self.data = []
+        self.times = np.empty(0, dtype=np.float64)
+        self.data = self._empty_data()
+        
+        # 地固系星历的所有时刻一次性处理
+        eph_times = datetimes_to_datetime64(satellite.eph_itrf['time'])
+        states = np.asarray(satellite.eph_itrf['cartesian'], dtype=np.float64)
+        if len(eph_times) == 0:
+            return
+        
+        # 先用几何仰角粗略筛选，明显低于仰角限制的时刻不做坐标转换
+        rho = states[:, :3] - station_pos
+        rho_norm = np.sqrt(np.einsum('ij,ij->i', rho, rho))
+        candidates = np.flatnonzero(rho @ zenith >= sin_ele_cut * rho_norm)
         
-        # 使用地固系星历计算每个时刻的观测数据
-        for time_point, state_vector in zip(satellite.eph_itrf['time'], satellite.eph_itrf['cartesian']):
+        if len(candidates) > 0:
             try:
-                # 转换时间到astropy Time对象
-                astropy_time = Time(time_point.isoformat())
-                
-                # 获取卫星在ITRF坐标系下的位置和速度
-                sat_position = state_vector[:3] * u.km  # [x, y, z]
-                sat_velocity = state_vector[3:6] * u.km / u.s  # [vx, vy, vz]
-                
-                # 创建卫星的ITRS坐标对象
-                sat_itrs = ITRS(
-                    CartesianRepresentation(
-                        x=sat_position[0],
-                        y=sat_position[1],
-                        z=sat_position[2]
-                    ),
-                    obstime=astropy_time
-                )
-
-                
-                # 转换到地面站的地平坐标系
-                sat_altaz = sat_itrs.transform_to(
-                    AltAz(obstime=astropy_time, location=station_location)
-                )
+                astropy_time = None
+                if fast:
+                    # 站心矢量直接旋转到地平坐标系
+                    azimuth, elevation = _topocentric_azel(rho[candidates], ground_station.longitude,
+                                                           ground_station.latitude)
+                else:
+                    # 转换时间到astropy Time对象（所有候选时刻组成一个时间数组）
+                    astropy_time = datetimes_to_time(eph_times[candidates])
+                    
+                    # 创建卫星的ITRS坐标对象并转换到地面站的地平坐标系
+                    sat_itrs = self._itrs_coordinates(states[candidates, :3], astropy_time)
+                    with self._astrom_context():
+                        sat_altaz = sat_itrs.transform_to(
+                            AltAz(obstime=astropy_time, location=station_location)
+                        )
+                    azimuth, elevation = sat_altaz.az.deg, sat_altaz.alt.deg
                 
                 # 检查可见性（仰角限制）
-                elevation = sat_altaz.alt.deg
-                if elevation < elevation_mask:
-                    continue  # 跳过仰角过低的观测
+                visible = elevation >= elevation_mask
+                visible_idx = candidates[visible]
                 
                 # 根据观测类型计算相应数据
                 if self.obs_type == 'Azi_Ele':
-                    azimuth = sat_altaz.az.deg
-                    obs_data = [azimuth, elevation]
+                    obs_data = np.column_stack([azimuth[visible], elevation[visible]])
                     
                 elif self.obs_type == 'RA_DEC':
-                    # 转换到GCRS坐标系以获取赤经赤纬
-                    sat_gcrs = sat_itrs.transform_to(GCRS(obstime=astropy_time))
-                    ra = sat_gcrs.ra.deg
-                    dec = sat_gcrs.dec.deg
-                    obs_data = [ra, dec]
+                    # 转换到GCRS坐标系以获取赤经赤纬（只转换可见时刻）
+                    # 已有候选时刻的Time数组时直接取可见部分，不再重新构造
+                    if astropy_time is not None:
+                        visible_time = astropy_time[visible]
+                    else:
+                        visible_time = datetimes_to_time(eph_times[visible_idx])
+                    # 显式经CIRS中转，位置与时间逐元素对应，中间坐标系保持一维(N,)，不广播成(N, M)
+                    with self._astrom_context():
+                        sat_cirs = self._itrs_coordinates(states[visible_idx, :3], visible_time).transform_to(
+                            CIRS(obstime=visible_time)
+                        )
+                        sat_gcrs = sat_cirs.transform_to(GCRS(obstime=visible_time))
+                    obs_data = np.column_stack([sat_gcrs.ra.deg, sat_gcrs.dec.deg])
                     
                 elif self.obs_type == 'R_RD':
                     # 计算测距和测速
-                    # 地面站在ITRF坐标系下的位置
-                    station_itrs = station_location.get_itrs(obstime=astropy_time)
-                    station_pos = np.array([
-                        station_itrs.x.to(u.km).value,
-                        station_itrs.y.to(u.km).value,
-                        station_itrs.z.to(u.km).value
-                    ])
-                    
-                    # 计算相对位置和速度
-                    relative_pos = state_vector[:3] - station_pos
-                    relative_vel = state_vector[3:6]  # 假设地面站速度为0（简化）
+                    # 相对速度假设地面站速度为0（简化）
+                    rel_position = rho[visible_idx]
                     
                     # 距离
-                    range_km = np.linalg.norm(relative_pos)
+                    range_km = rho_norm[visible_idx]
                     
-                    # 距离变化率（径向速度）
-                    range_rate = np.dot(relative_pos, relative_vel) / range_km
+                    # 距离变化率（径向速度），所有时刻的点积一次算出
+                    range_rate = np.einsum('ij,ij->i', rel_position, states[visible_idx, 3:6]) / range_km
                     
-                    obs_data = [range_km, range_rate]
+                    obs_data = np.column_stack([range_km, range_rate])
                 
                 else:
                     raise ValueError(f"不支持的观测类型: {self.obs_type}")
                 
                 # 存储观测数据
-                self.times.append(time_point)
-                self.data.append(obs_data)
+                self.times = _datetimes_to_mjd(eph_times[visible_idx])
+                self.data = obs_data
                 
             except Exception as e:
-                print(f"计算时刻 {time_point} 的观测数据时出错: {e}")
-                continue
+                print(f"计算{eph_times[candidates[0]].item()} 到 {eph_times[candidates[-1]].item()} 的观测数据时出错: {e}")
         
         print(f"成功计算{len(self.times)}个时刻的{self.obs_type}观测数据")
         if len(self.times) > 0:
-            print(f"观测时间范围: {self.times[0]} 到 {self.times[-1]}")
+            first_time, last_time = self._mjd_to_datetime(self.times[0]), self._mjd_to_datetime(self.times[-1])
+            print(f"观测时间范围: {first_time} 到 {last_time}")
+    
+    def times_as_datetime(self):
+        """
+        将观测时刻转换为datetime对象列表（用于绘图等面向用户的场合）
+        
+        返回:
+        list: datetime对象列表
+        """
+        mjd_day = np.floor(self.times)
+        return _mjd_to_datetimes(mjd_day, (self.times - mjd_day) * 86400.0)
     
     def _get_expected_data_length(self):
         """
@@ -306,6 +436,26 @@ class Access:
         else:
             return 2  # 默认
     
+    def _itrs_coordinates(self, positions, obstime):
+        """
+        由ITRF位置数组创建astropy的ITRS坐标对象
+        
+        参数:
+        positions (np.array): 形状(N, 3)的位置数组（km）
+        obstime (Time): 对应的时间数组
+        
+        返回:
+        ITRS: 卫星的ITRS坐标对象
+        """
+        # (3, N)视图一次性附加单位，不逐分量构造Quantity，也不复制位置数组
+        return ITRS(CartesianRepresentation(positions.T, unit=u.km, copy=False), obstime=obstime)
+    
+    def _empty_data(self):
+        """
+        返回不含观测记录的数据数组，形状(0, 数据长度)
+        """
+        return np.empty((0, self._get_expected_data_length()), dtype=np.float64)
+    
     def _mjd_to_datetime(self, mjd):
         """
         将修正儒略日(MJD)转换为datetime对象
@@ -316,10 +466,8 @@ class Access:
         返回:
         datetime: 对应的datetime对象
         """
-        # MJD = JD - 2400000.5
-        # 使用astropy的Time对象进行精确转换
-        astropy_time = Time(mjd, format='mjd')
-        return astropy_time.to_datetime()
+        # 直接由MJD起点加上天数计算，精确到微秒，与astropy的Time对象转换结果一致
+        return _MJD_EPOCH + datetime.timedelta(days=mjd)
     
     def _datetime_to_mjd(self, dt):
         """
@@ -331,8 +479,7 @@ class Access:
         返回:
         float: 对应的MJD
         """
-        astropy_time = Time(dt.isoformat())
-        return astropy_time.mjd
+        return (dt - _MJD_EPOCH).total_seconds() / 86400.0
     
     def get_observation_summary(self):
         """
@@ -351,14 +498,14 @@ class Access:
                 'data_range': None
             }
         
-        data_array = np.array(self.data)
+        data_array = np.asarray(self.data)
         
         summary = {
             'station_id': self.station_id,
             'satellite_id': self.satellite_id,
             'obs_type': self.obs_type,
             'data_count': len(self.data),
-            'time_range': (self.times[0], self.times[-1]),
+            'time_range': (self._mjd_to_datetime(self.times[0]), self._mjd_to_datetime(self.times[-1])),
             'data_range': {
                 'min': data_array.min(axis=0).tolist(),
                 'max': data_array.max(axis=0).tolist(),
@@ -382,18 +529,15 @@ class Access:
         if len(self.data) == 0:
             return
         
-        filtered_times = []
-        filtered_data = []
+        keep = self.data[:, 1] >= min_elevation  # 俯仰角是第二个数据
         
-        for time_obj, obs_data in zip(self.times, self.data):
-            elevation = obs_data[1]  # 俯仰角是第二个数据
-            if elevation >= min_elevation:
-                filtered_times.append(time_obj)
-                filtered_data.append(obs_data)
+        removed_count = len(self.times) - np.count_nonzero(keep)
         
-        removed_count = len(self.times) - len(filtered_times)
-        self.times = filtered_times
-        self.data = filtered_data
+        # calculate_observation_data已按仰角限制筛选，过滤阈值不高于计算时的限制时没有需要移除的点，
+        # 此时不复制数组
+        if removed_count > 0:
+            self.times = self.times[keep]
+            self.data = self.data[keep]
         
         print(f"仰角过滤完成: 移除{removed_count}个低仰角观测点，剩余{len(self.data)}个观测点")
 
@@ -427,6 +571,76 @@ def create_access_example(scenario):
     return access_list
 
 
+# 子进程中使用的场景对象，由进程池初始化函数设置
+_worker_scenario = None
+
+
+def _init_access_worker(scenario):
+    """
+    进程池初始化函数：保存场景对象，并限制子进程的BLAS线程数
+    """
+    global _worker_scenario
+    # 每个进程只用一个BLAS线程，避免进程数×线程数超过CPU核数
+    # （对spawn/forkserver启动方式下子进程中新加载的库生效）
+    for name in ('OPENBLAS_NUM_THREADS', 'OMP_NUM_THREADS', 'MKL_NUM_THREADS'):
+        os.environ[name] = '1'
+    _worker_scenario = scenario
+
+
+def _compute_access_task(access, kwargs):
+    """
+    在子进程中计算单个观测对象，返回(观测时刻MJD数组, 观测数据数组)
+    """
+    access.calculate_observation_data(_worker_scenario, **kwargs)
+    return access.times, access.data
+
+
+def compute_all(access_list, scenario, n_workers=None, **kwargs):
+    """
+    使用多进程并行计算多个观测对象的观测数据
+    
+    各观测对象的计算相互独立，按(地面站, 卫星, 观测类型)分配到不同进程。
+    卫星的地固系星历先在主进程中准备好，随场景对象一起传给子进程，子进程不重复计算轨道。
+    在脚本中调用时需放在 if __name__ == "__main__": 之下。
+    
+    参数:
+    access_list (list): Access对象列表
+    scenario (SatelliteScenario): 卫星场景对象
+    n_workers (int): 进程数，默认为CPU核数（不超过观测对象个数）
+    **kwargs: 传给calculate_observation_data的其他参数
+              （start_time, end_time, time_step, elevation_mask, fast）
+    
+    返回:
+    list: 计算完成的Access对象列表（即传入的access_list）
+    """
+    if len(access_list) == 0:
+        return access_list
+    
+    # 在主进程中确保所有相关卫星都有地固系星历
+    start_time = kwargs.get('start_time') or scenario.start_time
+    end_time = kwargs.get('end_time') or scenario.end_time
+    time_step = kwargs.get('time_step') or scenario.time_step
+    satellite_ids = {access.satellite_id for access in access_list}
+    for satellite in scenario.satellites:
+        if satellite.satellite_id not in satellite_ids:
+            continue
+        if len(satellite.eph['time']) == 0:
+            satellite.propagate_orbit(start_time, end_time, time_step)
+        satellite.ensure_itrf_ephemeris()
+    
+    max_workers = min(len(access_list), n_workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_access_worker,
+                             initargs=(scenario,)) as executor:
+        futures = [executor.submit(_compute_access_task, access, kwargs) for access in access_list]
+        for access, future in zip(access_list, futures):
+            try:
+                access.times, access.data = future.result()
+            except Exception as e:
+                print(f"计算观测对象 {access.station_id} → {access.satellite_id} ({access.obs_type}) 失败: {e}")
+    
+    return access_list
+
+
 if __name__ == "__main__":
     # 这里可以添加测试代码
     print("Access模块已加载")
\ No newline at end of file
@@ -0,0 +1,40 @@
+"""
+Batch helpers
+
+Shared by the batch tools that run an external executable once per job.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+
+def run_batch(func, jobs, job_name):
+    """
+    Run func once per job concurrently, at most one job per CPU core.
+    
+    Parameters:
+    -----------
+    func : callable
+        Function run for each job; it is called as func(**job)
+    jobs : list of dict
+        Keyword arguments of func for each run
+    job_name : str
+        Job description used in error messages, e.g. "orbit prediction"
+    
+    Returns:
+    --------
+    list: Result of each run, in the order of jobs; a job that raises gives an error message instead
+    """
+    def run_job(job):
+        try:
+            return func(**job)
+        except Exception as e:
+            return f"Error: Invalid {job_name} job {job}: {str(e)}"
+    
+    if not jobs:
+        return []
+    
+    # Each worker thread waits on its own subprocess, which releases the GIL
+    max_workers = min(len(jobs), os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(run_job, jobs))
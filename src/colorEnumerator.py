@@ -2,6 +2,37 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.colors import to_hex
 
+# RGB color list suitable for scientific papers
+# These colors are carefully selected for good distinction and print quality
+_RGB = np.array([
+    [213, 39, 40],    # Red
+    [204, 121, 167],  # Magenta
+    [0, 158, 115],    # Teal
+    [213, 94, 0],     # Orange
+    [0, 114, 178],    # Blue
+    [240, 228, 66],   # Yellow
+    [0, 0, 0],        # Black
+    [86, 180, 233],   # Sky Blue
+    [230, 159, 0],    # Amber
+    [0, 102, 0],      # Dark Green
+    [132, 0, 198],    # Purple
+    [100, 100, 100],  # Gray
+    [158, 115, 0],    # Brown
+    [70, 80, 180],    # Indigo
+    [187, 19, 62]     # Burgundy
+])
+_NAMES = (
+    "Red", "Magenta", "Teal", "Orange", "Blue", "Yellow",
+    "Black", "Sky Blue", "Amber", "Dark Green",
+    "Purple", "Gray", "Brown", "Indigo", "Burgundy"
+)
+
+# Palette normalized to 0-1 range for matplotlib, computed once at import time;
+# rows handed out by the enumerator are read-only views into it
+_PALETTE = _RGB.astype(np.float32) / 255.0
+_RGB.setflags(write=False)
+_PALETTE.setflags(write=False)
+
 class colorEnumerator:
     """
     RGB Color Enumerator: Defines a series of RGB colors suitable for scientific papers.
@@ -9,28 +40,11 @@ class colorEnumerator:
     without repetition or disorder.
     """
     
+    # Shared palette: (15, 3) integer RGB values and the normalized (15, 3) float32 array
+    colors = _RGB
+    normalized_colors = _PALETTE
+    
     def __init__(self):
-        # Define RGB color list suitable for scientific papers
-        # These colors are carefully selected for good distinction and print quality
-        self.colors = [
-            [213, 39, 40],    # Red
-            [204, 121, 167],  # Magenta
-            [0, 158, 115],    # Teal
-            [213, 94, 0],     # Orange
-            [0, 114, 178],    # Blue
-            [240, 228, 66],   # Yellow
-            [0, 0, 0],        # Black
-            [86, 180, 233],   # Sky Blue
-            [230, 159, 0],    # Amber
-            [0, 102, 0],      # Dark Green
-            [132, 0, 198],    # Purple
-            [100, 100, 100],  # Gray
-            [158, 115, 0],    # Brown
-            [70, 80, 180],    # Indigo
-            [187, 19, 62]     # Burgundy
-        ]
-        # Normalize RGB values to 0-1 range for matplotlib
-        self.normalized_colors = [[r/255, g/255, b/255] for r, g, b in self.colors]
         self.index = 0
     
     def __iter__(self):
@@ -40,19 +54,19 @@ class colorEnumerator:
     
     def __next__(self):
         """Get the next color"""
-        if self.index >= len(self.colors):
+        if self.index >= len(_PALETTE):
             raise StopIteration
         
-        color = self.normalized_colors[self.index]
+        color = _PALETTE[self.index]
         self.index += 1
         return color
     
     def next_color(self):
         """Get the next color. If all colors have been enumerated, restart from beginning."""
-        if self.index >= len(self.colors):
+        if self.index >= len(_PALETTE):
             self.index = 0
         
-        color = self.normalized_colors[self.index]
+        color = _PALETTE[self.index]
         self.index += 1
         return color
     
@@ -63,18 +77,13 @@ class colorEnumerator:
     
     def get_rgb_int(self):
         """Get the original RGB integer format"""
-        idx = self.index - 1 if self.index > 0 else len(self.colors) - 1
-        return self.colors[idx]
+        idx = self.index - 1 if self.index > 0 else len(_RGB) - 1
+        return _RGB[idx]
     
     def get_current_color_name(self):
         """Get the name of the current color (for labeling)"""
-        color_names = [
-            "Red", "Magenta", "Teal", "Orange", "Blue", "Yellow",
-            "Black", "Sky Blue", "Amber", "Dark Green",
-            "Purple", "Gray", "Brown", "Indigo", "Burgundy"
-        ]
-        idx = self.index - 1 if self.index > 0 else len(self.colors) - 1
-        return color_names[idx]
+        idx = self.index - 1 if self.index > 0 else len(_NAMES) - 1
+        return _NAMES[idx]
 
 
 def main():
@@ -1,40 +1,23 @@
-# 1.3 convert date to Modified Julian date
-def date2mjd(date: str) -> float:
+import datetime
+
+import numpy as np
+
+from src.jitTools import njit, prange
+
+_REFORM_GAP_ERROR = "Invalid calendar date during Gregorian calendar reform period (Oct 5-14, 1582)"
+
+
+@njit(cache=True)
+def _date2mjd_core(year, month, day, sec):
     """
-    Convert date to Modified Julian Date
-    
-    Parameters:
-    date: Date string in format "YYYY-MM-DD HH:MM:SS" or "YYYY-MM-DD"
+    JIT-compiled calendar arithmetic of date2mjd (Fortran date2MJD subroutine)
     
-    Returns:
-    float: Modified Julian Date
-    
-    Example:
-    date2mjd("2000-01-01 00:00:00") returns 51544.0
-    date2mjd("2000-01-01") returns 51544.0
+    Returns the Modified Julian Date of year/month/day plus sec seconds since midnight,
+    or NaN for the dates skipped by the Gregorian calendar reform (Oct 5-14, 1582);
+    the callers raise the error, since numba cannot raise inside parallel loops
     """
-    from datetime import datetime
-    
-    # Parse the date string
-    if len(date) == 10:  # YYYY-MM-DD format
-        dt = datetime.strptime(date, "%Y-%m-%d")
-    else:  # YYYY-MM-DD HH:MM:SS format
-        dt = datetime.strptime(date, "%Y-%m-%d %H:%M:%S")
-    
-    year = float(dt.year)
-    month = float(dt.month)
-    day = float(dt.day)
-    hour = dt.hour
-    minute = dt.minute
-    second = dt.second
-    
-    # Convert time to seconds since midnight
-    sec = hour * 3600 + minute * 60 + second
-    
-    # Implementation based on the Fortran date2MJD subroutine
     y = year
     m = month
-    b = 0.0
     c = 0.0
     
     if m <= 2:
@@ -44,49 +27,40 @@ def date2mjd(date: str) -> float:
     if y < 0:
         c = -0.75
     
-    # Check for valid calendar date (Gregorian calendar reform)
-    if year < 1582:
-        pass
-    elif year > 1582:
-        a = int(y / 100.0)
-        b = 2.0 - a + int(a / 4.0)
-    elif month < 10:
-        pass
-    elif month > 10:
-        a = int(y / 100.0)
-        b = 2.0 - a + int(a / 4.0)
-    elif day <= 4:
-        pass
-    elif day > 14:
-        a = int(y / 100.0)
-        b = 2.0 - a + int(a / 4.0)
-    else:
-        raise ValueError("Invalid calendar date during Gregorian calendar reform period (Oct 5-14, 1582)")
+    # Gregorian calendar reform: the correction applies from 1582-10-15 on,
+    # and Oct 5-14, 1582 do not exist
+    ymd = year * 10000.0 + month * 100.0 + day
+    if ymd > 15821004.0 and ymd < 15821015.0:
+        return np.nan
+    
+    a = int(y / 100.0)
+    b = 2.0 - a + int(a / 4.0) if ymd >= 15821015.0 else 0.0
     
     jd_tmp = int(365.25 * y + c) + int(30.6001 * (m + 1))
     mjd_day = jd_tmp + day + b - 679006.0
     mjd_sec = sec
     
     # Convert to single MJD value (day + fraction)
-    mjd = mjd_day + mjd_sec / 86400.0
-    
+    return mjd_day + mjd_sec / 86400.0
+
+
+@njit(parallel=True, cache=True)
+def _date2mjd_array_kernel(years, months, days, secs):
+    """
+    Parallel version of _date2mjd_core over arrays of dates
+    """
+    mjd = np.empty(years.shape[0])
+    for k in prange(years.shape[0]):
+        mjd[k] = _date2mjd_core(years[k], months[k], days[k], secs[k])
     return mjd
 
 
-# 1.4 convert Modified Julian date to date
-def mjd2date(mjd: float) -> str:
+@njit(cache=True)
+def _mjd2date_core(mjd):
     """
-    Convert Modified Julian Date to date
-    
-    Parameters:
-    mjd: Modified Julian Date
-    
-    Returns:
-    str: Date string in format "YYYY-MM-DD HH:MM:SS"
+    JIT-compiled calendar arithmetic of mjd2date (Fortran JD2date subroutine)
     
-    Example:
-    mjd2date(51544.0) returns "2000-01-01 00:00:00"
-    mjd2date(51544.5) returns "2000-01-01 12:00:00"
+    Returns (year, month, day, hour, minute, second) as integers
     """
     # Convert MJD to Julian Date
     jd = mjd + 2400000.5
@@ -103,7 +77,6 @@ def mjd2date(mjd: float) -> str:
         jd_frac -= 1.0
         jd_int += 1
     
-    # Implementation based on the Fortran JD2date subroutine
     # Convert Julian Date to Gregorian calendar date
     l = jd_int + 68569
     n = (4 * l) // 146097
@@ -133,9 +106,227 @@ def mjd2date(mjd: float) -> str:
         hour = 0
         # Would need to add a day, but this should be rare due to our fraction handling
     
+    return year, month, day, hour, minute, second
+
+
+# 1.3 convert date to Modified Julian date
+def date2mjd(date: str) -> float:
+    """
+    Convert date to Modified Julian Date
+    
+    Parameters:
+    date: Date string in format "YYYY-MM-DD HH:MM:SS" or "YYYY-MM-DD"
+    
+    Returns:
+    float: Modified Julian Date
+    
+    Example:
+    date2mjd("2000-01-01 00:00:00") returns 51544.0
+    date2mjd("2000-01-01") returns 51544.0
+    """
+    from datetime import datetime
+    
+    # Parse the date string
+    if len(date) == 10:  # YYYY-MM-DD format
+        dt = datetime.strptime(date, "%Y-%m-%d")
+    else:  # YYYY-MM-DD HH:MM:SS format
+        dt = datetime.strptime(date, "%Y-%m-%d %H:%M:%S")
+    
+    # Convert time to seconds since midnight
+    sec = dt.hour * 3600 + dt.minute * 60 + dt.second
+    
+    mjd = _date2mjd_core(float(dt.year), float(dt.month), float(dt.day), float(sec))
+    if np.isnan(mjd):
+        raise ValueError(_REFORM_GAP_ERROR)
+    
+    return mjd
+
+
+def date2mjd_array(years, months, days, secs) -> np.ndarray:
+    """
+    Convert arrays of calendar dates to Modified Julian Dates
+    
+    Parameters:
+    years, months, days: Calendar date components, array-like of equal length
+    secs: Seconds since midnight, array-like of the same length
+    
+    Returns:
+    np.ndarray: Modified Julian Dates
+    
+    Example:
+    date2mjd_array([2000, 2000], [1, 1], [1, 1], [0, 43200]) returns array([51544. , 51544.5])
+    """
+    mjd = _date2mjd_array_kernel(np.asarray(years, dtype=np.float64).ravel(),
+                                 np.asarray(months, dtype=np.float64).ravel(),
+                                 np.asarray(days, dtype=np.float64).ravel(),
+                                 np.asarray(secs, dtype=np.float64).ravel())
+    if np.isnan(mjd).any():
+        raise ValueError(_REFORM_GAP_ERROR)
+    
+    return mjd
+
+
+# Gregorian calendar dates can be converted directly with numpy's datetime64
+_MJD_EPOCH = np.datetime64('1858-11-17', 's')
+_GREGORIAN_START = np.datetime64('1582-10-15', 's')
+
+def date2mjd_batch(dates: list[str]) -> list[float]:
+    """
+    Convert a list of dates to Modified Julian Dates in one vectorized pass
+    
+    Parameters:
+    dates: List of date strings in format "YYYY-MM-DD HH:MM:SS" or "YYYY-MM-DD"
+    
+    Returns:
+    list: Modified Julian Dates, same order as the input
+    
+    Example:
+    date2mjd_batch(["2000-01-01 00:00:00", "2000-01-01 12:00:00"]) returns [51544.0, 51544.5]
+    """
+    times = np.array(dates, dtype='datetime64[s]')
+    mjd = (times - _MJD_EPOCH).astype(np.float64) / 86400.0
+    
+    # Dates before the Gregorian calendar reform use the Julian calendar
+    for k in np.flatnonzero(times < _GREGORIAN_START):
+        mjd[k] = date2mjd(dates[k])
+    
+    return mjd.tolist()
+
+
+_UNIX_EPOCH = datetime.datetime(1970, 1, 1)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+
+def datetimes_to_datetime64(times):
+    """
+    Convert a sequence of naive datetime objects to a datetime64[us] array
+    
+    Integer microsecond offsets are collected directly, which is several times
+    faster than numpy's per-object datetime conversion
+    
+    Parameters:
+    times: List of datetime objects, or a datetime64 array (returned as datetime64[us])
+    
+    Returns:
+    np.ndarray: datetime64[us] array
+    """
+    if isinstance(times, np.ndarray) and times.dtype.kind == 'M':
+        return times.astype('datetime64[us]')
+    
+    offsets = np.fromiter(((t - _UNIX_EPOCH) // _MICROSECOND for t in times),
+                          dtype=np.int64, count=len(times))
+    return offsets.view('datetime64[us]')
+
+
+def datetimes_to_time(times):
+    """
+    Convert a sequence of UTC datetimes to one astropy Time array
+    
+    The calendar fields are split with numpy datetime64 arithmetic and converted
+    with a single vectorized erfa.dtf2d call, which is much faster than letting
+    astropy parse each datetime object and still handles leap-second days exactly
+    
+    Parameters:
+    times: List of datetime objects or a datetime64 array
+    
+    Returns:
+    Time: astropy Time array in the UTC scale
+    """
+    import erfa
+    from astropy.time import Time
+    
+    times = datetimes_to_datetime64(times)
+    days = times.astype('datetime64[D]')
+    months = days.astype('datetime64[M]')
+    years = months.astype('datetime64[Y]')
+    
+    year = years.astype(np.int64) + 1970
+    month = (months - years.astype('datetime64[M]')).astype(np.int64) + 1
+    day = (days - months.astype('datetime64[D]')).astype(np.int64) + 1
+    
+    micros = (times - days).astype(np.int64)
+    hour, micros = np.divmod(micros, 3600000000)
+    minute, micros = np.divmod(micros, 60000000)
+    
+    jd1, jd2 = erfa.dtf2d(b'UTC', year, month, day, hour, minute, micros / 1e6)
+    return Time(jd1, jd2, format='jd', scale='utc')
+
+
+# 1.4 convert Modified Julian date to date
+def mjd2date(mjd: float) -> str:
+    """
+    Convert Modified Julian Date to date
+    
+    Parameters:
+    mjd: Modified Julian Date
+    
+    Returns:
+    str: Date string in format "YYYY-MM-DD HH:MM:SS"
+    
+    Example:
+    mjd2date(51544.0) returns "2000-01-01 00:00:00"
+    mjd2date(51544.5) returns "2000-01-01 12:00:00"
+    """
+    year, month, day, hour, minute, second = _mjd2date_core(float(mjd))
+    
     # Format as string
     return f"{year:04d}-{month:02d}-{day:02d} {hour:02d}:{minute:02d}:{second:02d}"
 
+
+def mjd2date_array(mjd) -> np.ndarray:
+    """
+    Convert an array of Modified Julian Dates to dates with NumPy integer arithmetic
+    
+    Parameters:
+    mjd: Array-like of Modified Julian Dates
+    
+    Returns:
+    np.ndarray: Date strings in format "YYYY-MM-DD HH:MM:SS", same as mjd2date for each element
+    
+    Example:
+    mjd2date_array([51544.0, 51544.5]) returns array(['2000-01-01 00:00:00', '2000-01-01 12:00:00'])
+    """
+    # Same steps as _mjd2date_core, applied to the whole array
+    jd = np.asarray(mjd, dtype=np.float64) + 2400000.5
+    
+    jd_int = np.trunc(jd + 0.5).astype(np.int64)
+    jd_frac = jd + 0.5 - jd_int
+    
+    below = jd_frac < 0
+    above = jd_frac >= 1.0
+    jd_frac = np.where(below, jd_frac + 1.0, np.where(above, jd_frac - 1.0, jd_frac))
+    jd_int = jd_int - below + above
+    
+    l = jd_int + 68569
+    n = (4 * l) // 146097
+    l = l - (146097 * n + 3) // 4
+    i = (4000 * (l + 1)) // 1461001
+    l = l - (1461 * i) // 4 + 31
+    k = (80 * l) // 2447
+    day = l - (2447 * k) // 80
+    l = k // 11
+    month = k + 2 - 12 * l
+    year = 100 * (n - 49) + i + l
+    
+    total_seconds = jd_frac * 86400.0
+    hour = (total_seconds // 3600).astype(np.int64)
+    minute = ((total_seconds % 3600) // 60).astype(np.int64)
+    second = (total_seconds % 60).astype(np.int64)
+    
+    # Handle rounding errors that might cause seconds to be 60
+    carry = second >= 60
+    second = np.where(carry, 0, second)
+    minute = minute + carry
+    carry = minute >= 60
+    minute = np.where(carry, 0, minute)
+    hour = hour + carry
+    hour = np.where(hour >= 24, 0, hour)
+    
+    # Assemble datetime64 values from the components and format them in one call
+    dates = ((year - 1970).astype('datetime64[Y]').astype('datetime64[M]')
+             + (month - 1).astype('timedelta64[M]')).astype('datetime64[s]')
+    dates = dates + ((day - 1) * 86400 + hour * 3600 + minute * 60 + second).astype('timedelta64[s]')
+    return np.char.replace(np.datetime_as_string(dates, unit='s'), 'T', ' ')
+
 if __name__ == "__main__":
     # Test the functions
     print(date2mjd("2000-01-01 00:00:00"))
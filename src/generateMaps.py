@@ -4,172 +4,187 @@ World Map Generator - Clean Style with Multiple Color Schemes
 生成干净的世界地图平面图，提供多种颜色风格
 """
 
+import matplotlib
 import matplotlib.pyplot as plt
 import cartopy.crs as ccrs
 import cartopy.feature as cfeature
+import cartopy.mpl.path as cpath
+from matplotlib.collections import PathCollection
+import functools
+from types import MappingProxyType
+import numpy as np
+from PIL import Image
 import warnings
 import os
+from concurrent.futures import ProcessPoolExecutor
 
 # 忽略cartopy的警告信息
 warnings.filterwarnings('ignore')
 
-def get_color_styles():
+@functools.lru_cache(maxsize=None)
+def _feature_geometries(name):
     """
-    定义不同的颜色风格配置
+    读取Natural Earth要素的几何图形，同一进程内只解析一次，生成各风格地图时共用
+    
+    参数:
+    name (str): 要素名称，'ocean'、'land'、'coastline'或'borders'
     
     返回:
-    dict: 包含各种风格配置的字典
+    tuple: (几何图形所在坐标系, 几何图形元组)
     """
-    styles = {
-        'classic': {
-            'name': 'Classic',
-            'land_color': 'lightgray',
-            'land_alpha': 0.3,
-            'ocean_color': 'lightblue', 
-            'ocean_alpha': 0.3,
-            'coastline_color': 'black',
-            'coastline_width': 0.5,
-            'border_color': 'gray',
-            'border_width': 0.3,
-            'background': 'white'
-        },
-        
-        'dark': {
-            'name': 'Dark Theme',
-            'land_color': '#2F4F4F',  # DarkSlateGray
-            'land_alpha': 0.8,
-            'ocean_color': '#191970',  # MidnightBlue
-            'ocean_alpha': 0.8,
-            'coastline_color': '#F0F8FF',  # AliceBlue
-            'coastline_width': 0.6,
-            'border_color': '#708090',  # SlateGray
-            'border_width': 0.4,
-            'background': '#1C1C1C'  # Dark background
-        },
-        
-        'minimalist': {
-            'name': 'Minimalist',
-            'land_color': '#F5F5F5',  # WhiteSmoke
-            'land_alpha': 1.0,
-            'ocean_color': '#FFFFFF',  # White
-            'ocean_alpha': 1.0,
-            'coastline_color': '#696969',  # DimGray
-            'coastline_width': 0.4,
-            'border_color': '#D3D3D3',  # LightGray
-            'border_width': 0.2,
-            'background': 'white'
-        },
-        
-        'natural': {
-            'name': 'Natural',
-            'land_color': '#DEB887',  # BurlyWood
-            'land_alpha': 0.7,
-            'ocean_color': '#4682B4',  # SteelBlue
-            'ocean_alpha': 0.6,
-            'coastline_color': '#8B4513',  # SaddleBrown
-            'coastline_width': 0.5,
-            'border_color': '#A0522D',  # Sienna
-            'border_width': 0.3,
-            'background': '#F0F8FF'  # AliceBlue
-        },
-        
-        'high_contrast': {
-            'name': 'High Contrast',
-            'land_color': '#000000',  # Black
-            'land_alpha': 1.0,
-            'ocean_color': '#FFFFFF',  # White
-            'ocean_alpha': 1.0,
-            'coastline_color': '#FF0000',  # Red
-            'coastline_width': 0.8,
-            'border_color': '#FF0000',  # Red
-            'border_width': 0.5,
-            'background': '#FFFFFF'
-        },
-        
-        'vintage': {
-            'name': 'Vintage',
-            'land_color': '#F4A460',  # SandyBrown
-            'land_alpha': 0.8,
-            'ocean_color': '#B0C4DE',  # LightSteelBlue
-            'ocean_alpha': 0.7,
-            'coastline_color': '#8B4513',  # SaddleBrown
-            'coastline_width': 0.6,
-            'border_color': '#CD853F',  # Peru
-            'border_width': 0.4,
-            'background': '#FDF5E6'  # OldLace
-        },
-        
-        'arctic': {
-            'name': 'Arctic',
-            'land_color': '#F0F8FF',  # AliceBlue
-            'land_alpha': 0.9,
-            'ocean_color': '#4169E1',  # RoyalBlue
-            'ocean_alpha': 0.4,
-            'coastline_color': '#191970',  # MidnightBlue
-            'coastline_width': 0.5,
-            'border_color': '#4682B4',  # SteelBlue
-            'border_width': 0.3,
-            'background': '#F8F8FF'  # GhostWhite
-        },
-        
-        'earth_tones': {
-            'name': 'Earth Tones',
-            'land_color': '#D2B48C',  # Tan
-            'land_alpha': 0.7,
-            'ocean_color': '#008B8B',  # DarkCyan
-            'ocean_alpha': 0.5,
-            'coastline_color': '#8B4513',  # SaddleBrown
-            'coastline_width': 0.5,
-            'border_color': '#A0522D',  # Sienna
-            'border_width': 0.3,
-            'background': '#FFFAF0'  # FloralWhite
-        }
-    }
-    
-    return styles
+    feature = getattr(cfeature, name.upper())
+    geometries = tuple(feature.geometries())  # 读取shapefile时会更新要素的坐标系
+    return feature.crs, geometries
 
-def generate_world_map(style='classic', 
-                      output_filename=None,
-                      figsize=(10, 6), 
-                      dpi=30):
+@functools.lru_cache(maxsize=None)
+def _feature_paths(name):
     """
-    生成指定风格的世界地图并保存到data目录
+    将要素几何图形转换为matplotlib路径，同一进程内只转换一次，各风格地图直接复用
+    
+    Natural Earth数据本身就是PlateCarree坐标，与地图投影相同，无需重投影
     
     参数:
-    style (str): 风格名称，默认'classic'
-    output_filename (str): 输出文件名，如果为None则自动生成
-    figsize (tuple): 图形尺寸，默认(10, 6)
-    dpi (int): 分辨率，默认30
+    name (str): 要素名称，'ocean'、'land'、'coastline'或'borders'
+    
+    返回:
+    tuple: matplotlib路径元组
     """
+    _, geometries = _feature_geometries(name)
+    return tuple(cpath.shapely_to_path(geometry) for geometry in geometries)
+
+# 各风格的颜色配置（只读），所有调用共用同一个对象
+_COLOR_STYLES = {
+    'classic': {
+        'name': 'Classic',
+        'land_color': 'lightgray',
+        'land_alpha': 0.3,
+        'ocean_color': 'lightblue', 
+        'ocean_alpha': 0.3,
+        'coastline_color': 'black',
+        'coastline_width': 0.5,
+        'border_color': 'gray',
+        'border_width': 0.3,
+        'background': 'white'
+    },
     
-    # 确保data目录存在
-    if not os.path.exists('data'):
-        os.makedirs('data')
-        print("Created 'data' directory")
+    'dark': {
+        'name': 'Dark Theme',
+        'land_color': '#2F4F4F',  # DarkSlateGray
+        'land_alpha': 0.8,
+        'ocean_color': '#191970',  # MidnightBlue
+        'ocean_alpha': 0.8,
+        'coastline_color': '#F0F8FF',  # AliceBlue
+        'coastline_width': 0.6,
+        'border_color': '#708090',  # SlateGray
+        'border_width': 0.4,
+        'background': '#1C1C1C'  # Dark background
+    },
     
-    # 获取风格配置
-    styles = get_color_styles()
-    if style not in styles:
-        print(f"Warning: Style '{style}' not found, using 'classic'")
-        style = 'classic'
+    'minimalist': {
+        'name': 'Minimalist',
+        'land_color': '#F5F5F5',  # WhiteSmoke
+        'land_alpha': 1.0,
+        'ocean_color': '#FFFFFF',  # White
+        'ocean_alpha': 1.0,
+        'coastline_color': '#696969',  # DimGray
+        'coastline_width': 0.4,
+        'border_color': '#D3D3D3',  # LightGray
+        'border_width': 0.2,
+        'background': 'white'
+    },
     
-    style_config = styles[style]
+    'natural': {
+        'name': 'Natural',
+        'land_color': '#DEB887',  # BurlyWood
+        'land_alpha': 0.7,
+        'ocean_color': '#4682B4',  # SteelBlue
+        'ocean_alpha': 0.6,
+        'coastline_color': '#8B4513',  # SaddleBrown
+        'coastline_width': 0.5,
+        'border_color': '#A0522D',  # Sienna
+        'border_width': 0.3,
+        'background': '#F0F8FF'  # AliceBlue
+    },
     
-    # 生成输出文件名
-    if output_filename is None:
-        output_filename = f"data/world_map_{style}.jpg"
-    else:
-        output_filename = f"data/{output_filename}"
+    'high_contrast': {
+        'name': 'High Contrast',
+        'land_color': '#000000',  # Black
+        'land_alpha': 1.0,
+        'ocean_color': '#FFFFFF',  # White
+        'ocean_alpha': 1.0,
+        'coastline_color': '#FF0000',  # Red
+        'coastline_width': 0.8,
+        'border_color': '#FF0000',  # Red
+        'border_width': 0.5,
+        'background': '#FFFFFF'
+    },
     
-    # 设置字体
-    plt.rcParams['font.family'] = 'Arial'
-    plt.rcParams['font.sans-serif'] = 'Arial'
+    'vintage': {
+        'name': 'Vintage',
+        'land_color': '#F4A460',  # SandyBrown
+        'land_alpha': 0.8,
+        'ocean_color': '#B0C4DE',  # LightSteelBlue
+        'ocean_alpha': 0.7,
+        'coastline_color': '#8B4513',  # SaddleBrown
+        'coastline_width': 0.6,
+        'border_color': '#CD853F',  # Peru
+        'border_width': 0.4,
+        'background': '#FDF5E6'  # OldLace
+    },
     
+    'arctic': {
+        'name': 'Arctic',
+        'land_color': '#F0F8FF',  # AliceBlue
+        'land_alpha': 0.9,
+        'ocean_color': '#4169E1',  # RoyalBlue
+        'ocean_alpha': 0.4,
+        'coastline_color': '#191970',  # MidnightBlue
+        'coastline_width': 0.5,
+        'border_color': '#4682B4',  # SteelBlue
+        'border_width': 0.3,
+        'background': '#F8F8FF'  # GhostWhite
+    },
+    
+    'earth_tones': {
+        'name': 'Earth Tones',
+        'land_color': '#D2B48C',  # Tan
+        'land_alpha': 0.7,
+        'ocean_color': '#008B8B',  # DarkCyan
+        'ocean_alpha': 0.5,
+        'coastline_color': '#8B4513',  # SaddleBrown
+        'coastline_width': 0.5,
+        'border_color': '#A0522D',  # Sienna
+        'border_width': 0.3,
+        'background': '#FFFAF0'  # FloralWhite
+    }
+}
+_COLOR_STYLES = MappingProxyType({name: MappingProxyType(config) for name, config in _COLOR_STYLES.items()})
+
+def get_color_styles():
+    """
+    定义不同的颜色风格配置
+    
+    返回:
+    Mapping: 包含各种风格配置的只读字典
+    """
+    return _COLOR_STYLES
+
+def _create_map_figure(figsize=(10, 6), dpi=30):
+    """
+    创建世界地图图形并添加地图要素，各要素的颜色、线宽等由_apply_style设置
+    
+    参数:
+    figsize (tuple): 图形尺寸，默认(10, 6)
+    dpi (int): 分辨率，默认30
+    
+    返回:
+    tuple: (fig, ax, artists)，artists为各地图要素的图形对象字典
+    """
     # 使用PlateCarree投影
     proj = ccrs.PlateCarree()
     
     # 创建图形，不显示坐标轴
-    fig = plt.figure(figsize=figsize, frameon=False, facecolor=style_config['background'])
+    fig = plt.figure(figsize=figsize, dpi=dpi, frameon=False)
     ax = plt.axes(projection=proj)
     
     # 移除所有边框和坐标轴
@@ -180,60 +195,215 @@ def generate_world_map(style='classic',
     ax.set_global()
     ax.set_extent([-180, 180, -90, 90], ccrs.PlateCarree())
     
-    # 设置背景色 - 修正方法
+    # 添加地图要素，直接使用缓存的路径，省去cartopy每次绘制时的几何处理
+    artists = {}
+    for name in ('ocean', 'land', 'coastline', 'borders'):
+        artist = PathCollection(_feature_paths(name), transform=ax.transData, zorder=1.5)
+        artist.set_clip_path(ax.patch)
+        artists[name] = ax.add_collection(artist, autolim=False)
+    
+    # 线状要素只绘制边线，不填充
+    artists['coastline'].set_facecolor('none')
+    artists['borders'].set_facecolor('none')
+    
+    # 预览图分辨率很低，抗锯齿没有可见效果，全部要素关闭抗锯齿
+    for artist in artists.values():
+        artist.set_antialiased(False)
+    
+    # 调整图形布局，去除所有边距
+    plt.subplots_adjust(left=0, right=1, top=1, bottom=0)
+    
+    return fig, ax, artists
+
+def _apply_style(fig, artists, style_config):
+    """
+    将风格配置应用到已创建的地图图形上
+    
+    参数:
+    fig: matplotlib图形对象
+    artists (dict): _create_map_figure返回的地图要素图形对象
+    style_config (dict): 风格配置
+    """
+    # 设置背景色
     fig.patch.set_facecolor(style_config['background'])
     
-    # 添加地图要素（使用风格配置）
-    ax.add_feature(cfeature.OCEAN, 
-                   color=style_config['ocean_color'], 
-                   alpha=style_config['ocean_alpha'])
+    artists['ocean'].set_color(style_config['ocean_color'])
+    artists['ocean'].set_alpha(style_config['ocean_alpha'])
     
-    ax.add_feature(cfeature.LAND, 
-                   color=style_config['land_color'], 
-                   alpha=style_config['land_alpha'])
+    artists['land'].set_color(style_config['land_color'])
+    artists['land'].set_alpha(style_config['land_alpha'])
     
-    ax.add_feature(cfeature.COASTLINE, 
-                   linewidth=style_config['coastline_width'], 
-                   color=style_config['coastline_color'])
+    artists['coastline'].set_edgecolor(style_config['coastline_color'])
+    artists['coastline'].set_linewidth(style_config['coastline_width'])
     
-    ax.add_feature(cfeature.BORDERS, 
-                   linewidth=style_config['border_width'], 
-                   color=style_config['border_color'])
+    artists['borders'].set_edgecolor(style_config['border_color'])
+    artists['borders'].set_linewidth(style_config['border_width'])
+
+# 绘制地图时的渲染参数：路径按像素精度简化，长路径由Agg分块绘制
+_RENDER_RC = {
+    'path.simplify': True,
+    'path.simplify_threshold': 1.0,
+    'agg.path.chunksize': 10000,
+}
+
+def _save_jpeg(fig, ax, output_filename):
+    """
+    绘制图形并将地图区域直接交给Pillow保存为JPEG
     
-    # 调整图形布局，去除所有边距
-    plt.subplots_adjust(left=0, right=1, top=1, bottom=0)
+    地图区域即坐标轴在画布上的范围（图形边距已去除），裁剪结果与
+    savefig(bbox_inches='tight', pad_inches=0)相同，但不需要再计算一次紧凑边界
+    
+    参数:
+    fig: matplotlib图形对象
+    ax: 地图坐标轴对象
+    output_filename (str): 输出文件路径
+    
+    返回:
+    tuple: 图片的(宽, 高)像素数
+    """
+    with plt.rc_context(_RENDER_RC):
+        fig.canvas.draw()
+    buf = np.asarray(fig.canvas.buffer_rgba())
+    
+    # 显示坐标原点在左下角，图像数组的行从上往下
+    bbox = ax.get_window_extent()
+    height = buf.shape[0]
+    x0, x1 = int(round(bbox.x0)), int(round(bbox.x1))
+    y0, y1 = height - int(round(bbox.y1)), height - int(round(bbox.y0))
+    
+    # 图形无边框，未绘制要素处是透明的；与matplotlib的JPEG保存一致，
+    # 按alpha通道合成到白色背景上，各要素的透明度才会生效
+    crop = Image.fromarray(buf[y0:y1, x0:x1])
+    image = Image.new('RGB', crop.size, 'white')
+    image.paste(crop, crop)
+    image.save(output_filename, 'JPEG', quality=85, subsampling=2, optimize=False,
+               dpi=(fig.dpi, fig.dpi))
+    return image.size
+
+def _render_style(fig, ax, artists, style, output_filename):
+    """
+    按指定风格设置地图图形并保存到data目录
+    
+    参数:
+    fig: matplotlib图形对象
+    ax: 地图坐标轴对象
+    artists (dict): _create_map_figure返回的地图要素图形对象
+    style (str): 风格名称
+    output_filename (str): 输出文件名，如果为None则自动生成
+    """
+    # 获取风格配置
+    styles = get_color_styles()
+    if style not in styles:
+        print(f"Warning: Style '{style}' not found, using 'classic'")
+        style = 'classic'
+    
+    style_config = styles[style]
+    
+    # 生成输出文件名
+    if output_filename is None:
+        output_filename = f"data/world_map_{style}.jpg"
+    else:
+        output_filename = f"data/{output_filename}"
+    
+    _apply_style(fig, artists, style_config)
     
     # 保存图片
     print(f"Generating {style_config['name']} style world map...")
     
-    plt.savefig(output_filename, 
-                format='jpeg',
-                dpi=dpi, 
-                bbox_inches='tight',
-                pad_inches=0,
-                facecolor=style_config['background'],
-                edgecolor='none')
+    width, height = _save_jpeg(fig, ax, output_filename)
     
     print(f"Saved: {output_filename}")
-    print(f"Resolution: {figsize[0]*dpi} x {figsize[1]*dpi} pixels")
+    print(f"Resolution: {width} x {height} pixels")
+
+def _ensure_data_directory():
+    """
+    确保data目录存在
+    """
+    if not os.path.exists('data'):
+        os.makedirs('data')
+        print("Created 'data' directory")
+
+def generate_world_map(style='classic', 
+                      output_filename=None,
+                      figsize=(10, 6), 
+                      dpi=30):
+    """
+    生成指定风格的世界地图并保存到data目录
+    
+    参数:
+    style (str): 风格名称，默认'classic'
+    output_filename (str): 输出文件名，如果为None则自动生成
+    figsize (tuple): 图形尺寸，默认(10, 6)
+    dpi (int): 分辨率，默认30
+    """
+    _ensure_data_directory()
+    
+    fig, ax, artists = _create_map_figure(figsize, dpi)
+    try:
+        _render_style(fig, ax, artists, style, output_filename)
+    finally:
+        # 关闭图形释放内存
+        plt.close(fig)
+
+def _init_render_worker():
+    """
+    进程池子进程的初始化函数：子进程只保存图片，使用非交互式后端
+    """
+    matplotlib.use('Agg')
+
+def _render_styles(style_names, figsize, dpi):
+    """
+    在一个图形上依次生成多种风格的地图（进程池任务）
     
-    # 关闭图形释放内存
-    plt.close()
+    参数:
+    style_names (list): 风格名称列表
+    figsize (tuple): 图形尺寸
+    dpi (int): 分辨率
+    """
+    fig, ax, artists = _create_map_figure(figsize, dpi)
+    try:
+        for style_name in style_names:
+            _render_style(fig, ax, artists, style_name, None)
+            print()  # 空行分隔
+    finally:
+        # 关闭图形释放内存
+        plt.close(fig)
 
-def generate_all_styles():
+def generate_all_styles(figsize=(10, 6), dpi=30, n_workers=None):
     """
     生成所有风格的世界地图
+    
+    风格分组后由多个进程并行生成；每个进程内的各风格共用同一个图形，
+    只在保存前修改各要素的颜色、透明度和线宽。
+    在脚本中调用时需放在 if __name__ == "__main__": 之下。
+    
+    参数:
+    figsize (tuple): 图形尺寸，默认(10, 6)
+    dpi (int): 分辨率，默认30
+    n_workers (int): 进程数，默认为CPU核数（不超过风格个数），为1时在当前进程中生成
     """
     styles = get_color_styles()
+    style_names = list(styles.keys())
     
     print(f"Generating {len(styles)} different style maps...")
     print("=" * 60)
     
-    for style_name in styles.keys():
-        generate_world_map(style=style_name)
-        print()  # 空行分隔
+    _ensure_data_directory()
+    
+    max_workers = min(len(style_names), n_workers or os.cpu_count() or 1)
+    if max_workers <= 1:
+        _render_styles(style_names, figsize, dpi)
+        return style_names
+    
+    # 风格轮流分配到各进程，每个进程只创建一次图形
+    groups = [style_names[k::max_workers] for k in range(max_workers)]
+    with ProcessPoolExecutor(max_workers=max_workers,
+                             initializer=_init_render_worker) as executor:
+        futures = [executor.submit(_render_styles, group, figsize, dpi) for group in groups]
+        for future in futures:
+            future.result()
     
-    return list(styles.keys())
+    return style_names
 
 def list_available_styles():
     """
@@ -0,0 +1,21 @@
+"""
+Numba JIT helpers
+
+numba is an optional dependency (install with the "jit" extra). When it is
+available the decorated kernels are compiled to machine code; otherwise the
+decorators below are no-ops and the kernels run as plain Python.
+"""
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit, supporting both @njit and @njit(...)"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+    prange = range
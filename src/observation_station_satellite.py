@@ -1,6 +1,28 @@
 import os
 import subprocess
 
+from src.batchTools import run_batch
+
+# Set executable path
+EXECUTABLE_PATH = "./bin/observation.exe"
+
+# Absolute paths already found to exist. Only positive results are kept: the executable
+# and ephemeris files are not removed between runs, while a file that is missing now
+# (e.g. an ephemeris still to be generated) may appear later and must be checked again.
+_EXISTING_PATHS = set()
+
+
+def _exists(path):
+    """Return True if path exists, stat-ing each existing file only once per process"""
+    key = os.path.abspath(path)
+    if key in _EXISTING_PATHS:
+        return True
+    if os.path.exists(key):
+        _EXISTING_PATHS.add(key)
+        return True
+    return False
+
+
 def run_satellite_observation(
     ts: float,
     step: float,
@@ -50,15 +72,14 @@ def run_satellite_observation(
     str: Result message indicating success or failure
     """
     
-    # Set executable path
-    executable_path = "./bin/observation.exe"
+    executable_path = EXECUTABLE_PATH
     
     # Check if executable exists
-    if not os.path.exists(executable_path):
+    if not _exists(executable_path):
         return f"Error: Observation executable not found at {executable_path}"
     
     # Check if ephemeris file exists
-    if not os.path.exists(fn_eph):
+    if not _exists(fn_eph):
         return f"Error: Ephemeris file not found: {fn_eph}"
     
     # Build command arguments list
@@ -82,11 +103,12 @@ def run_satellite_observation(
         cmd_args.append(fn_data)
     
     try:
-        # Run the executable
-        result = subprocess.run(
+        # Run the executable; its progress output on stdout is never used, so it is
+        # discarded instead of buffered, and stderr is only decoded on failure
+        subprocess.run(
             cmd_args,
-            capture_output=True,
-            text=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
             check=True,
             timeout=300  # 5 minutes timeout
         )
@@ -106,7 +128,7 @@ def run_satellite_observation(
     except subprocess.CalledProcessError as e:
         error_msg = f"Error: Satellite observation failed with return code {e.returncode}"
         if e.stderr:
-            error_msg += f"\nError output: {e.stderr}"
+            error_msg += f"\nError output: {e.stderr.decode('utf-8', 'replace')}"
         return error_msg
     
     except FileNotFoundError:
@@ -115,6 +137,26 @@ def run_satellite_observation(
     except Exception as e:
         return f"Error: Unexpected error occurred: {str(e)}"
 
+def run_satellite_observation_batch(jobs: list[dict]) -> list[str]:
+    """
+    Run several satellite observation calculations concurrently, at most one executable per CPU core.
+    
+    The observation executable takes a single job from its command line and has no
+    batch mode, so each job still starts its own process; the jobs overlap instead.
+    
+    Parameters:
+    -----------
+    jobs : list of dict
+        Keyword arguments of run_satellite_observation for each run
+        (ts, step, te, longitude, latitude, altitude, obs_type, min_ele,
+        solar_distance, lunar_distance, fn_eph and optional fn_data)
+    
+    Returns:
+    --------
+    list of str: Result message of each run, in the order of jobs
+    """
+    return run_batch(run_satellite_observation, jobs, "observation")
+
 if __name__ == "__main__":
     # Example usage
     result = run_satellite_observation(
@@ -1,4 +1,6 @@
+import math
 import numpy as np
+from src.jitTools import njit, prange, NUMBA_AVAILABLE
 
 #######################################################################################
 class ModuleConst:
@@ -76,8 +78,254 @@ class ModuleConst:
     isBDT = 4
     isGPST = 5
 
+# Module-level copies of the constants used by the JIT kernels, so numba can fold them
+_LENGTH_UNIT = ModuleConst.length_unit
+_TIME_UNIT = ModuleConst.time_unit
+_DEG2RAD = ModuleConst.deg2rad
+_RAD2DEG = ModuleConst.rad2deg
+_TWO_PI = 2.0 * math.pi
+
+# Eager signatures of the public kernels: they are compiled (or loaded from the cache)
+# at import, so neither array nor direct scalar calls pay the compile cost later
+_STATE_SIGNATURE = "UniTuple(float64, 6)(float64, float64, float64, float64, float64, float64)"
+_KERNEL_SIGNATURE = "float64[:](float64[:], float64[:])"
+
+@njit(cache=True, fastmath=True)
+def _wrap_two_pi(angle):
+    """
+    Reduce an angle (radians) to [0, 2π) without branching
+    """
+    return angle - _TWO_PI * math.floor(angle / _TWO_PI)
+
+# π/2 split into a leading part with a short mantissa and a tail (Cody-Waite), so
+# k*π/2 is subtracted exactly in the argument reduction of _sincos_poly
+_HALF_PI_HI = 1.57079632673412561417e+00
+_HALF_PI_LO = 6.07710050650619224932e-11
+_TWO_OVER_PI = 2.0 / math.pi
+
+@njit(cache=True, fastmath=True)
+def _sincos_poly(x):
+    """
+    sin(x) and cos(x) from polynomials, for the fast_math kernels
+    
+    x is reduced to r in [-π/4, π/4] by the nearest multiple k of π/2, sin(r) and
+    cos(r) are evaluated as Horner-form series (error below 1e-16 on that interval),
+    and the quadrant k mod 4 selects the signs. About twice as fast as libm sin + cos
+    and accurate to a few ulp for moderate |x|
+    
+    Returns (sin(x), cos(x))
+    """
+    k = math.floor(x * _TWO_OVER_PI + 0.5)
+    r = (x - k * _HALF_PI_HI) - k * _HALF_PI_LO
+    r2 = r * r
+    sin_r = r + r * r2 * (-1.0 / 6.0 + r2 * (1.0 / 120.0 + r2 * (-1.0 / 5040.0 + r2 * (
+        1.0 / 362880.0 + r2 * (-1.0 / 39916800.0 + r2 * (1.0 / 6227020800.0 + r2 * (
+            -1.0 / 1307674368000.0)))))))
+    cos_r = 1.0 + r2 * (-0.5 + r2 * (1.0 / 24.0 + r2 * (-1.0 / 720.0 + r2 * (1.0 / 40320.0 + r2 * (
+        -1.0 / 3628800.0 + r2 * (1.0 / 479001600.0 + r2 * (-1.0 / 87178291200.0 + r2 * (
+            1.0 / 20922789888000.0))))))))
+    
+    quadrant = int(k) & 3
+    if quadrant == 0:
+        return sin_r, cos_r
+    if quadrant == 1:
+        return cos_r, -sin_r
+    if quadrant == 2:
+        return -sin_r, -cos_r
+    return -cos_r, sin_r
+
+@njit(cache=True, fastmath=True)
+def _sincos(x, fast_math):
+    """
+    sin(x) and cos(x), from _sincos_poly when fast_math is True, otherwise from libm
+    """
+    if fast_math:
+        return _sincos_poly(x)
+    return math.sin(x), math.cos(x)
+
+# Danby iterations for Kepler's equation: each step converges quartically, so from the
+# seed below four steps reach machine precision for e up to 0.99 (three suffice for e < 0.95)
+_KEPLER_ITERATIONS = 4
+
+# A Danby step smaller than this (radians) leaves an error far below machine precision,
+# so the iteration stops there
+_KEPLER_TOLERANCE = 1e-6
+
+# Below this eccentricity the orbit is treated as circular and E = M is used directly:
+# the error |E - M| <= e/(1-e) stays under 1e-12 rad, i.e. below 0.05 mm at GEO
+_CIRCULAR_ECCENTRICITY = 1e-12
+
+# A starting guess is accepted if its residual |E - e*sin(E) - M| is below this (radians)
+_KEPLER_GUESS_RESIDUAL = 0.1
+
+@njit(cache=True, fastmath=True)
+def solve_kepler(M, e, E_guess=-1.0, fast_math=False):
+    """
+    Solve Kepler's equation E - e*sin(E) = M (radians, M in [0, 2π)) with Danby's method
+    
+    Starts from E_guess when given (E is never negative, so a negative value means no
+    guess; NaN cannot be used under fastmath) and close enough, otherwise from E = M ± 0.85e
+    (sign of sin M, i.e. M below or above π), and iterates until the step falls below
+    _KEPLER_TOLERANCE, at most _KEPLER_ITERATIONS times. Each step uses one sin/cos
+    pair for f and all three derivatives. sin(E) and cos(E) of the result are returned
+    as well: the last pair is rotated by the (tiny) final step with a short Taylor
+    series, so no further trig call is needed
+    
+    For circular orbits (e < _CIRCULAR_ECCENTRICITY) E = M is returned without iterating
+    
+    Propagators stepping M by small increments can pass the previous solution advanced
+    by dM / (1 - e*cos(E)) as E_guess; one or two steps then suffice
+    
+    Parameters:
+    M (float): Mean anomaly (radians, in [0, 2π))
+    e (float): Eccentricity
+    E_guess (float): Starting value for E (radians), or negative for none
+    fast_math (bool): Use the polynomial sin/cos of _sincos_poly
+    
+    Returns:
+    tuple: (E, sin(E), cos(E))
+    """
+    if e < _CIRCULAR_ECCENTRICITY:
+        sin_M, cos_M = _sincos(M, fast_math)
+        return M, sin_M, cos_M
+    
+    E = E_guess
+    if E >= 0.0:
+        sin_E, cos_E = _sincos(E, fast_math)
+    if E < 0.0 or abs(E - e * sin_E - M) >= _KEPLER_GUESS_RESIDUAL:
+        E = M + 0.85 * e if M <= math.pi else M - 0.85 * e
+        sin_E, cos_E = _sincos(E, fast_math)
+    
+    step = 0.0
+    for k in range(_KEPLER_ITERATIONS):
+        e_sin, e_cos = e * sin_E, e * cos_E
+        f = E - e_sin - M
+        f1 = 1.0 - e_cos
+        d1 = -f / f1
+        d2 = -f / (f1 + 0.5 * d1 * e_sin)
+        step = -f / (f1 + 0.5 * d2 * e_sin + d2 * d2 * e_cos / 6.0)
+        E = E + step
+        if abs(step) < _KEPLER_TOLERANCE or k == _KEPLER_ITERATIONS - 1:
+            break
+        sin_E, cos_E = _sincos(E, fast_math)
+    
+    step2 = step * step
+    sin_step = step * (1.0 - step2 / 6.0)
+    cos_step = 1.0 - 0.5 * step2 * (1.0 - step2 / 12.0)
+    return E, sin_E * cos_step + cos_E * sin_step, cos_E * cos_step - sin_E * sin_step
+
+def _solve_kepler_vec(M, e):
+    """
+    Element-wise version of solve_kepler for NumPy arrays (no starting guess, fixed number
+    of steps), returning (E, sin(E), cos(E))
+    """
+    if np.all(e < _CIRCULAR_ECCENTRICITY):
+        return M, np.sin(M), np.cos(M)
+    
+    E = M + 0.85 * e * np.where(M <= np.pi, 1.0, -1.0)
+    for _ in range(_KEPLER_ITERATIONS):
+        sin_E, cos_E = np.sin(E), np.cos(E)
+        e_sin, e_cos = e * sin_E, e * cos_E
+        f = E - e_sin - M
+        f1 = 1.0 - e_cos
+        d1 = -f / f1
+        d2 = -f / (f1 + 0.5 * d1 * e_sin)
+        step = -f / (f1 + 0.5 * d2 * e_sin + d2 * d2 * e_cos / 6.0)
+        E = E + step
+    
+    step2 = step * step
+    sin_step = step * (1.0 - step2 / 6.0)
+    cos_step = 1.0 - 0.5 * step2 * (1.0 - step2 / 12.0)
+    return E, sin_E * cos_step + cos_E * sin_step, cos_E * cos_step - sin_E * sin_step
+
 #######################################################################################
-def kpl2cts(elements):
+def kpl2cts_vec(elements, fast_math=False):
+    """
+    Convert a batch of Keplerian elements to Cartesian coordinates
+    
+    Parameters:
+    elements (array-like): Array of shape (N, 6), each row holding
+        [a, e, i, C_omega, omega, M] in the same units as kpl2cts
+        (km, dimensionless, degrees)
+    fast_math (bool): See kpl2cts_soa
+    
+    Returns:
+    numpy.ndarray: Array of shape (N, 6), each row [x, y, z, vx, vy, vz] (km, km/s)
+    """
+    # Take a float64 (N, 6) view; the input is never modified
+    elements = np.asarray(elements, dtype=np.float64).reshape(-1, 6)
+    return kpl2cts_soa(*elements.T, fast_math=fast_math)
+
+def kpl2cts_soa(a, e, i, C_omega, omega, M, fast_math=False):
+    """
+    Convert Keplerian elements given as separate arrays (structure of arrays)
+    to Cartesian coordinates
+    
+    The six inputs are broadcast against each other, so constant elements can be
+    passed as scalars, e.g. a fixed orbit sampled at an array of mean anomalies.
+    
+    Parameters:
+    a, e, i, C_omega, omega, M (float or array-like): Keplerian elements in the
+        same units as kpl2cts (km, dimensionless, degrees)
+    fast_math (bool): Convert in a parallel JIT kernel with polynomial sin/cos
+        instead of libm (results differ by a few ulp); ignored without numba
+    
+    Returns:
+    numpy.ndarray: Array of shape (N, 6), each row [x, y, z, vx, vy, vz] (km, km/s)
+    """
+    if fast_math and NUMBA_AVAILABLE:
+        elements = np.broadcast_arrays(*(np.asarray(x, dtype=np.float64)
+                                         for x in (a, e, i, C_omega, omega, M)))
+        return _kpl2cts_batch_fast(*(np.ravel(x) for x in elements))
+    
+    # Normalize units and convert degrees to radians
+    a = np.asarray(a, dtype=np.float64) / ModuleConst.length_unit
+    e_element = np.asarray(e, dtype=np.float64)
+    i, C_omega, omega, M = (np.asarray(angle, dtype=np.float64) * ModuleConst.deg2rad
+                            for angle in (i, C_omega, omega, M))
+    n = np.broadcast(a, e_element, i, C_omega, omega, M).size
+    
+    sin_i, cos_i = np.sin(i), np.cos(i)
+    sin_C, cos_C = np.sin(C_omega), np.cos(C_omega)
+    sin_w, cos_w = np.sin(omega), np.cos(omega)
+    
+    # Calculate P and Q vectors, stacked as the columns of the (N, 3, 2) PQW->ECI rotation
+    R = np.empty((n, 3, 2))
+    R[:, 0, 0] = np.ravel(cos_C * cos_w - sin_C * sin_w * cos_i)
+    R[:, 1, 0] = np.ravel(sin_C * cos_w + cos_C * sin_w * cos_i)
+    R[:, 2, 0] = np.ravel(sin_w * sin_i)
+    R[:, 0, 1] = np.ravel(-cos_C * sin_w - sin_C * cos_w * cos_i)
+    R[:, 1, 1] = np.ravel(-sin_C * sin_w + cos_C * cos_w * cos_i)
+    R[:, 2, 1] = np.ravel(cos_w * sin_i)
+    
+    # Broadcast the remaining per-element quantities to flat (N,) arrays
+    a = np.broadcast_to(a, (n,)) if a.size == 1 else a.ravel()
+    e_element = np.broadcast_to(e_element, (n,)) if e_element.size == 1 else e_element.ravel()
+    M = np.broadcast_to(M, (n,)) if M.size == 1 else M.ravel()
+    
+    # Solve Kepler's equation over the whole batch
+    E, sin_E, cos_E = _solve_kepler_vec(M % (2 * np.pi), e_element)
+    
+    sqrt_1me2 = np.sqrt(1.0 - e_element * e_element)
+    
+    # Position and velocity in the perifocal (P, Q) frame
+    r_pq = np.column_stack((a * (cos_E - e_element), a * sqrt_1me2 * sin_E))
+    r = np.einsum('ijk,ik->ij', R, r_pq)
+    r_norm = np.sqrt(r[:, 0]**2 + r[:, 1]**2 + r[:, 2]**2)
+    
+    v_scale = np.sqrt(a) / r_norm
+    v_pq = np.column_stack((-v_scale * sin_E, v_scale * sqrt_1me2 * cos_E))
+    v = np.einsum('ijk,ik->ij', R, v_pq)
+    
+    # Combine position and velocity into Cartesian elements
+    cts = np.empty((n, 6))
+    cts[:, 0:3] = r * ModuleConst.length_unit  # Convert to km
+    cts[:, 3:6] = v * ModuleConst.length_unit / ModuleConst.time_unit  # Convert to km/s
+    
+    return cts
+
+#######################################################################################
+def kpl2cts(elements, out=None):
     """
     Convert Keplerian elements to Cartesian coordinates
     
@@ -89,142 +337,298 @@ def kpl2cts(elements):
         elements[3]: C_omega - longitude of ascending node (uppercase omega/Ω) (degrees)
         elements[4]: omega - argument of periapsis (lowercase omega/ω) (degrees)
         elements[5]: M - mean anomaly (degrees)
+    out (numpy.ndarray, optional): float64 array of 6 elements to write the result
+        into, so repeated calls can reuse one buffer; a new array is allocated if None
     
     Returns:
     numpy.ndarray: Array of 6 Cartesian elements [x, y, z, vx, vy, vz] (km, km/s)
     """
-    # Make a copy to avoid modifying the original input
-    elements = np.array(elements, dtype=float)
-    
-    # Constants
-    pi_constant = np.pi
+    if out is None:
+        out = np.empty(6)
+    return _kpl2cts_kernel(np.asarray(elements, dtype=np.float64), out)
 
-    elements[0] = elements[0] / ModuleConst.length_unit
-    elements[2:6] = elements[2:6] * ModuleConst.deg2rad  # Convert degrees to radians
+@njit(cache=True, fastmath=True)
+def kepler_frame(a, e, i, C_omega, omega, fast_math=False):
+    """
+    Precompute the parts of kpl2cts that do not depend on the mean anomaly
     
-    # Extract Keplerian elements
-    a = elements[0]
-    e_element = elements[1]
-    i = elements[2]
-    C_omega = elements[3]
-    omega = elements[4]
-    M = elements[5]
+    Propagators that only advance M can build the frame once per orbit and call
+    kpl2cts_frame at every step, skipping the six trig calls of the P, Q rotation
     
-    # Calculate P and Q vectors
-    P = np.zeros(3)
-    Q = np.zeros(3)
+    Parameters:
+    a, e, i, C_omega, omega (float): Keplerian elements, units as in kpl2cts
+    fast_math (bool): Use the polynomial sin/cos of _sincos_poly
+    
+    Returns:
+    tuple: (a, e, sqrt(1-e^2), P0, P1, P2, Q0, Q1, Q2), a in normalized units
+    """
+    sin_i, cos_i = _sincos(i * _DEG2RAD, fast_math)
+    sin_C, cos_C = _sincos(C_omega * _DEG2RAD, fast_math)
+    sin_w, cos_w = _sincos(omega * _DEG2RAD, fast_math)
     
-    P[0] = np.cos(C_omega) * np.cos(omega) - np.sin(C_omega) * np.sin(omega) * np.cos(i)
-    P[1] = np.sin(C_omega) * np.cos(omega) + np.cos(C_omega) * np.sin(omega) * np.cos(i)
-    P[2] = np.sin(omega) * np.sin(i)
+    # Calculate P and Q vectors
+    P0 = cos_C * cos_w - sin_C * sin_w * cos_i
+    P1 = sin_C * cos_w + cos_C * sin_w * cos_i
+    P2 = sin_w * sin_i
     
-    Q[0] = -np.cos(C_omega) * np.sin(omega) - np.sin(C_omega) * np.cos(omega) * np.cos(i)
-    Q[1] = -np.sin(C_omega) * np.sin(omega) + np.cos(C_omega) * np.cos(omega) * np.cos(i)
-    Q[2] = np.cos(omega) * np.sin(i)
+    Q0 = -cos_C * sin_w - sin_C * cos_w * cos_i
+    Q1 = -sin_C * sin_w + cos_C * cos_w * cos_i
+    Q2 = cos_w * sin_i
     
-    # Solve Kepler's equation iteratively
-    M_mod = M % (2 * pi_constant)
-    E = M_mod
+    return (a / _LENGTH_UNIT, e, math.sqrt(1.0 - e * e), P0, P1, P2, Q0, Q1, Q2)
+
+@njit(cache=True, fastmath=True)
+def kpl2cts_anomaly(frame, sin_E, cos_E):
+    """
+    Cartesian coordinates of the orbit given by kepler_frame at the eccentric anomaly E,
+    given as sin(E) and cos(E)
     
-    # Use more iterations for better accuracy
-    for _ in range(10):
-        E_new = E - (E - e_element * np.sin(E) - M_mod) / (1 - e_element * np.cos(E))
-        if abs(E_new - E) < 1e-12:
-            break
-        E = E_new
+    Returns:
+    tuple: (x, y, z, vx, vy, vz) (km, km/s)
+    """
+    a, e_element, sqrt_1me2, P0, P1, P2, Q0, Q1, Q2 = frame
     
     # Calculate position vector
-    r = a * (np.cos(E) - e_element) * P + a * np.sqrt(1.0 - e_element**2) * np.sin(E) * Q
-    r_norm = np.sqrt(r[0]**2 + r[1]**2 + r[2]**2)
+    rp = a * (cos_E - e_element)
+    rq = a * sqrt_1me2 * sin_E
+    x = rp * P0 + rq * Q0
+    y = rp * P1 + rq * Q1
+    z = rp * P2 + rq * Q2
+    r_norm = math.sqrt(x * x + y * y + z * z)
     
     # Calculate velocity vector
-    v = np.sqrt(a) / r_norm * (-np.sin(E) * P + np.sqrt(1.0 - e_element**2) * np.cos(E) * Q)
+    v_scale = math.sqrt(a) / r_norm
+    vp = -v_scale * sin_E
+    vq = v_scale * sqrt_1me2 * cos_E
     
     # Combine position and velocity into Cartesian elements
-    cts = np.zeros(6)
-    cts[0:3] = r * ModuleConst.length_unit  # Convert to km
-    cts[3:6] = v * ModuleConst.length_unit / ModuleConst.time_unit  # Convert to km/s
+    v_unit = _LENGTH_UNIT / _TIME_UNIT  # Convert to km/s
+    return (x * _LENGTH_UNIT, y * _LENGTH_UNIT, z * _LENGTH_UNIT,  # Convert to km
+            (vp * P0 + vq * Q0) * v_unit,
+            (vp * P1 + vq * Q1) * v_unit,
+            (vp * P2 + vq * Q2) * v_unit)
+
+@njit(cache=True, fastmath=True)
+def kpl2cts_frame(frame, M, fast_math=False):
+    """
+    Convert the mean anomaly M (degrees) of an orbit given by kepler_frame to
+    Cartesian coordinates
+    
+    Returns:
+    tuple: (x, y, z, vx, vy, vz) (km, km/s)
+    """
+    # Solve Kepler's equation
+    E, sin_E, cos_E = solve_kepler(_wrap_two_pi(M * _DEG2RAD), frame[1], -1.0, fast_math)
+    return kpl2cts_anomaly(frame, sin_E, cos_E)
+
+@njit(cache=True, fastmath=True)
+def _kpl2cts_state(a, e, i, C_omega, omega, M, fast_math):
+    """
+    Body of kpl2cts_scalar below; fast_math selects the polynomial sin/cos of _sincos_poly
+    """
+    return kpl2cts_frame(kepler_frame(a, e, i, C_omega, omega, fast_math), M, fast_math)
+
+@njit(_STATE_SIGNATURE, cache=True, fastmath=True)
+def kpl2cts_scalar(a, e, i, C_omega, omega, M):
+    """
+    Convert one set of Keplerian elements to Cartesian coordinates without
+    allocating arrays
     
+    Parameters:
+    a, e, i, C_omega, omega, M (float): Keplerian elements, units as in kpl2cts
+    
+    Returns:
+    tuple: (x, y, z, vx, vy, vz) (km, km/s)
+    """
+    return _kpl2cts_state(a, e, i, C_omega, omega, M, False)
+
+@njit(_KERNEL_SIGNATURE, cache=True, fastmath=True)
+def _kpl2cts_kernel(elements, cts):
+    """
+    JIT-compiled single-state kernel of kpl2cts, on a float64 array of 6 elements,
+    writing into the output array cts
+    """
+    cts[0], cts[1], cts[2], cts[3], cts[4], cts[5] = kpl2cts_scalar(
+        elements[0], elements[1], elements[2], elements[3], elements[4], elements[5])
+    return cts
+
+@njit(parallel=True, cache=True, fastmath=True)
+def _kpl2cts_batch_fast(a, e, i, C_omega, omega, M):
+    """
+    Parallel fast_math kernel of kpl2cts_soa over flat arrays of equal length
+    """
+    cts = np.empty((a.shape[0], 6))
+    for k in prange(a.shape[0]):
+        (cts[k, 0], cts[k, 1], cts[k, 2],
+         cts[k, 3], cts[k, 4], cts[k, 5]) = _kpl2cts_state(a[k], e[k], i[k], C_omega[k],
+                                                            omega[k], M[k], True)
     return cts
 
 #######################################################################################
-def cts2kpl(rv):
+def cts2kpl_vec(rv):
     """
-    Convert Cartesian coordinates to Keplerian elements
+    Convert a batch of Cartesian coordinates to Keplerian elements
     
     Parameters:
-    rv (array-like): Array of 6 Cartesian elements [x, y, z, vx, vy, vz] (km, km/s)
+    rv (array-like): Array of shape (N, 6), each row [x, y, z, vx, vy, vz] (km, km/s)
     
     Returns:
-    numpy.ndarray: Array of 6 Keplerian elements
-        [a, e, i, C_omega, omega, M]
-        a - semi-major axis (km)
-        e - eccentricity
-        i - inclination (degrees)
-        C_omega - longitude of ascending node (uppercase omega/Ω) (degrees)
-        omega - argument of periapsis (lowercase omega/ω) (degrees)
-        M - mean anomaly (degrees)
+    numpy.ndarray: Array of shape (N, 6), each row [a, e, i, C_omega, omega, M]
+        in the same units as cts2kpl (km, dimensionless, degrees)
     """
-    # Make a copy to avoid modifying the original input
-    rv = np.array(rv, dtype=float)
+    # Take a float64 (N, 6) view; the input is never modified
+    rv = np.asarray(rv, dtype=np.float64).reshape(-1, 6)
     
     # Extract position and velocity vectors
-    r = rv[0:3] / ModuleConst.length_unit  
-    v = rv[3:6] * ModuleConst.time_unit / ModuleConst.length_unit 
+    r = rv[:, 0:3] / ModuleConst.length_unit
+    v = rv[:, 3:6] * ModuleConst.time_unit / ModuleConst.length_unit
     
     # Set gravitational parameter (mu)
     miu = 1.0
     
+    x, y, z = r[:, 0], r[:, 1], r[:, 2]
+    vx, vy, vz = v[:, 0], v[:, 1], v[:, 2]
+    
     # Calculate norms
-    v_norm = np.linalg.norm(v)
-    r_norm = np.linalg.norm(r)
+    v2 = vx * vx + vy * vy + vz * vz
+    r_norm = np.sqrt(x * x + y * y + z * z)
+    r_dot_v = x * vx + y * vy + z * vz
     
     # Calculate semi-major axis
-    a = 1.0 / (2.0 / r_norm - v_norm**2 / miu)
+    a = 1.0 / (2.0 / r_norm - v2 / miu)
+    sqrt_a = np.sqrt(miu * a)
     
     # Calculate eccentricity
-    e_element = np.sqrt((1.0 - r_norm / a)**2 + 
-                       (np.dot(r, v) / np.sqrt(miu * a))**2)
+    e_element = np.sqrt((1.0 - r_norm / a)**2 + (r_dot_v / sqrt_a)**2)
     
     # Calculate eccentric anomaly
-    E = np.arctan2(np.dot(r, v) / np.sqrt(miu * a), 1.0 - r_norm / a)
+    E = np.arctan2(r_dot_v / sqrt_a, 1.0 - r_norm / a)
+    sin_E, cos_E = np.sin(E), np.cos(E)
+    
+    # Calculate mean anomaly, in [0, 2π) range: E is in (-π, π] and so is E - e*sin(E),
+    # so adding 2π to the negative values replaces the floating-point modulo
+    M = E - e_element * sin_E
+    M = np.where(M < 0.0, M + _TWO_PI, M)
+    
+    # Calculate P and Q vectors (only the z components are needed for omega)
+    sqrt_a_miu = np.sqrt(a / miu)
+    P_z = cos_E / r_norm * z - sqrt_a_miu * sin_E * vz
+    Q_z = (sin_E / r_norm * z +
+           sqrt_a_miu * (cos_E - e_element) * vz) / np.sqrt(1.0 - e_element * e_element)
+    
+    # Calculate angular momentum vector (cross product written out per component)
+    h_scale = 1.0 / np.sqrt(miu * a * (1.0 - e_element * e_element))
+    R0 = (y * vz - z * vy) * h_scale
+    R1 = (z * vx - x * vz) * h_scale
+    R2 = (x * vy - y * vx) * h_scale
+    
+    # Calculate angular elements, in [0, 2π) range (arctan2 returns (-π, π])
+    omega = np.arctan2(P_z, Q_z)
+    omega = np.where(omega < 0.0, omega + _TWO_PI, omega)
+    C_omega = np.arctan2(R0, -R1)
+    C_omega = np.where(C_omega < 0.0, C_omega + _TWO_PI, C_omega)
+    i = np.arccos(np.minimum(1.0, np.maximum(-1.0, R2)))  # Clip to avoid numerical errors
     
-    # Calculate true anomaly
-    f = np.arctan2(np.sqrt(1.0 - e_element**2) * np.sin(E), np.cos(E) - e_element)
+    # Return Keplerian elements
+    elements = np.empty((rv.shape[0], 6))
+    elements[:, 0] = a * ModuleConst.length_unit  # Convert to km
+    elements[:, 1] = e_element
+    elements[:, 2] = i * ModuleConst.rad2deg  # Convert radians to degrees
+    elements[:, 3] = C_omega * ModuleConst.rad2deg
+    elements[:, 4] = omega * ModuleConst.rad2deg
+    elements[:, 5] = M * ModuleConst.rad2deg
+
+    return elements
+
+#######################################################################################
+def cts2kpl(rv, out=None):
+    """
+    Convert Cartesian coordinates to Keplerian elements
     
-    # Calculate mean anomaly
-    M = E - e_element * np.sin(E)
+    Parameters:
+    rv (array-like): Array of 6 Cartesian elements [x, y, z, vx, vy, vz] (km, km/s)
+    out (numpy.ndarray, optional): float64 array of 6 elements to write the result
+        into, as in kpl2cts
     
-    # Ensure M is in [0, 2π] range
-    M = M % (2 * np.pi)
+    Returns:
+    numpy.ndarray: Array of 6 Keplerian elements
+        [a, e, i, C_omega, omega, M]
+        a - semi-major axis (km)
+        e - eccentricity
+        i - inclination (degrees)
+        C_omega - longitude of ascending node (uppercase omega/Ω) (degrees)
+        omega - argument of periapsis (lowercase omega/ω) (degrees)
+        M - mean anomaly (degrees)
+    """
+    if out is None:
+        out = np.empty(6)
+    return _cts2kpl_kernel(np.asarray(rv, dtype=np.float64), out)
+
+@njit(_STATE_SIGNATURE, cache=True, fastmath=True)
+def cts2kpl_scalar(x, y, z, vx, vy, vz):
+    """
+    Convert one Cartesian state to Keplerian elements without allocating arrays
     
-    # Calculate P and Q vectors
-    P = np.cos(E) / r_norm * r - np.sqrt(a / miu) * np.sin(E) * v
-    Q = (1.0 - e_element**2)**(-0.5) * (np.sin(E) / r_norm * r + 
-         np.sqrt(a / miu) * (np.cos(E) - e_element) * v)
+    Parameters:
+    x, y, z, vx, vy, vz (float): Cartesian state (km, km/s)
     
-    # Calculate angular momentum vector
-    R_array = np.zeros(3)
-    R_array[0] = r[1] * v[2] - r[2] * v[1]
-    R_array[1] = r[2] * v[0] - r[0] * v[2]
-    R_array[2] = r[0] * v[1] - r[1] * v[0]
-    R_array = R_array / np.sqrt(miu * a * (1.0 - e_element**2))
+    Returns:
+    tuple: (a, e, i, C_omega, omega, M), units as in cts2kpl
+    """
+    # Normalize position and velocity
+    x, y, z = x / _LENGTH_UNIT, y / _LENGTH_UNIT, z / _LENGTH_UNIT
+    v_unit = _TIME_UNIT / _LENGTH_UNIT
+    vx, vy, vz = vx * v_unit, vy * v_unit, vz * v_unit
     
-    # Calculate angular elements
-    omega = np.arctan2(P[2], Q[2])
-    C_omega = np.arctan2(R_array[0], -R_array[1])
-    i = np.arccos(np.clip(R_array[2], -1.0, 1.0))  # Clip to avoid numerical errors
+    # Calculate norms (mu = 1 in normalized units)
+    r_norm = math.sqrt(x * x + y * y + z * z)
+    v2 = vx * vx + vy * vy + vz * vz
+    r_dot_v = x * vx + y * vy + z * vz
     
-    # Ensure angles are in [0, 2π] range
-    omega = omega % (2 * np.pi)
-    C_omega = C_omega % (2 * np.pi)
+    # Calculate semi-major axis
+    a = 1.0 / (2.0 / r_norm - v2)
+    sqrt_a = math.sqrt(a)
     
-    # Return Keplerian elements
-    elements = np.array([a, e_element, i, C_omega, omega, M])
-
-    elements[0] = elements[0] * ModuleConst.length_unit  # Convert to km
-    elements[2:6] = elements[2:6] * ModuleConst.rad2deg  # Convert radians to degrees
+    # Calculate eccentricity
+    e_cos_E = 1.0 - r_norm / a
+    e_sin_E = r_dot_v / sqrt_a
+    e_element = math.sqrt(e_cos_E * e_cos_E + e_sin_E * e_sin_E)
+    
+    # Calculate eccentric anomaly and mean anomaly
+    E = math.atan2(e_sin_E, e_cos_E)
+    sin_E, cos_E = math.sin(E), math.cos(E)
+    M = _wrap_two_pi(E - e_element * sin_E)
+    
+    # Calculate P and Q vectors (only the z components are needed for omega)
+    P2 = cos_E / r_norm * z - sqrt_a * sin_E * vz
+    Q2 = (sin_E / r_norm * z + sqrt_a * (cos_E - e_element) * vz) / math.sqrt(1.0 - e_element * e_element)
+    
+    # Calculate angular momentum vector
+    h_scale = 1.0 / math.sqrt(a * (1.0 - e_element * e_element))
+    R0 = (y * vz - z * vy) * h_scale
+    R1 = (z * vx - x * vz) * h_scale
+    R2 = (x * vy - y * vx) * h_scale
+    
+    # Calculate angular elements, in [0, 2π] range
+    omega = _wrap_two_pi(math.atan2(P2, Q2))
+    C_omega = _wrap_two_pi(math.atan2(R0, -R1))
+    i = math.acos(min(1.0, max(-1.0, R2)))  # Clip to avoid numerical errors
+    
+    return (a * _LENGTH_UNIT,  # Convert to km
+            e_element,
+            i * _RAD2DEG,  # Convert radians to degrees
+            C_omega * _RAD2DEG,
+            omega * _RAD2DEG,
+            M * _RAD2DEG)
 
+@njit(_KERNEL_SIGNATURE, cache=True, fastmath=True)
+def _cts2kpl_kernel(rv, elements):
+    """
+    JIT-compiled single-state kernel of cts2kpl, on a float64 array of 6 elements,
+    writing into the output array elements
+    """
+    elements[0], elements[1], elements[2], elements[3], elements[4], elements[5] = cts2kpl_scalar(
+        rv[0], rv[1], rv[2], rv[3], rv[4], rv[5])
     return elements
 
 #######################################################################################
@@ -2,6 +2,28 @@
 import subprocess
 import os
 
+from src.batchTools import run_batch
+
+# Set executable path
+EXECUTABLE_PATH = "./bin/orbitPrediction_numerical.exe"
+
+# Timeout of a single orbit prediction run (seconds)
+TIMEOUT = 300
+
+# Completed runs: command arguments -> (mtime, size) of the ephemeris file they wrote.
+# The executable reads everything from its arguments and exits, so a repeated call
+# with the same arguments whose output file is untouched can reuse that file.
+_COMPLETED_RUNS = {}
+
+
+def _file_signature(filename):
+    """Return (mtime, size) of a file, or None if it does not exist"""
+    try:
+        st = os.stat(filename)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
 
 def run_orbitPrediction_numerical(
     start_time: str,
@@ -25,7 +47,8 @@ def run_orbitPrediction_numerical(
     K_SRP: int = 0,
     K_drag: int = 0,
     K_PN: int = 0,
-) -> str:
+    wait: bool = True,
+):
     """
     Run orbit prediction using the .exe executable.
     
@@ -96,10 +119,18 @@ def run_orbitPrediction_numerical(
     
     K_PN : int, optional (default=0)
         Post-Newtonian flag
+    
+    wait : bool, optional (default=True)
+        If False, start the executable and return immediately with its
+        subprocess.Popen handle; pass it to collect_orbitPrediction_result
+        to wait for the run and get the result message.
+        If True, a run with the same arguments as an earlier successful one
+        returns immediately when its output file has not changed since
 
     Returns:
     --------
     str: Result message indicating success or failure
+    (subprocess.Popen when wait is False and the executable was started)
 
     Examples:
     ---------
@@ -127,8 +158,7 @@ def run_orbitPrediction_numerical(
     )
     """
 
-    # Set executable path
-    executable_path = "./bin/orbitPrediction_numerical.exe"
+    executable_path = EXECUTABLE_PATH
 
     # Check if executable exists
     if not os.path.exists(executable_path):
@@ -168,36 +198,90 @@ def run_orbitPrediction_numerical(
         str(K_PN)
     ]
     
+    # Reuse the output of an identical earlier run if the file is unchanged
+    if wait:
+        signature = _COMPLETED_RUNS.get(tuple(cmd_args))
+        if signature is not None and signature == _file_signature(filename):
+            return f"Orbit prediction completed successfully. Ephemeris saved to {filename} (previous result reused)"
+    
     try:
-        # Run the executable
-        result = subprocess.run(
+        # Start the executable
+        process = subprocess.Popen(
             cmd_args,
-            capture_output=True,
-            text=True,
-            check=True,
-            timeout=300  # 5 minutes timeout
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True
         )
         
-        # Check if output file was created
-        if os.path.exists(filename):
-            return f"Orbit prediction completed successfully. Ephemeris saved to {filename}"
-        else:
-            return f"Warning: Orbit prediction completed but output file {filename} was not found"
-            
-    except subprocess.TimeoutExpired:
-        return f"Error: Orbit prediction timed out after 300 seconds"
-    
-    except subprocess.CalledProcessError as e:
-        error_msg = f"Error: Orbit prediction failed with return code {e.returncode}"
-        if e.stderr:
-            error_msg += f"\nError output: {e.stderr}"
-        return error_msg
-    
     except FileNotFoundError:
         return f"Error: Executable not found at {executable_path}"
     
     except Exception as e:
         return f"Error: Unexpected error occurred: {str(e)}"
+    
+    if not wait:
+        return process
+    
+    return collect_orbitPrediction_result(process, filename)
+
+
+def collect_orbitPrediction_result(process, filename: str) -> str:
+    """
+    Wait for an orbit prediction run started with wait=False and return its result message.
+    
+    Parameters:
+    -----------
+    process : subprocess.Popen
+        Handle returned by run_orbitPrediction_numerical(..., wait=False)
+    
+    filename : str
+        Output ephemeris filename of that run
+    
+    Returns:
+    --------
+    str: Result message indicating success or failure
+    """
+    try:
+        _, stderr = process.communicate(timeout=TIMEOUT)
+        
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.communicate()
+        return f"Error: Orbit prediction timed out after {TIMEOUT} seconds"
+    
+    except Exception as e:
+        return f"Error: Unexpected error occurred: {str(e)}"
+    
+    if process.returncode != 0:
+        error_msg = f"Error: Orbit prediction failed with return code {process.returncode}"
+        if stderr:
+            error_msg += f"\nError output: {stderr}"
+        return error_msg
+    
+    # Check if output file was created
+    signature = _file_signature(filename)
+    if signature is not None:
+        _COMPLETED_RUNS[tuple(process.args)] = signature
+        return f"Orbit prediction completed successfully. Ephemeris saved to {filename}"
+    else:
+        return f"Warning: Orbit prediction completed but output file {filename} was not found"
+
+
+def run_orbitPrediction_numerical_batch(jobs: list[dict]) -> list[str]:
+    """
+    Run several orbit predictions concurrently, at most one executable per CPU core.
+    
+    Parameters:
+    -----------
+    jobs : list of dict
+        Keyword arguments of run_orbitPrediction_numerical for each run
+        (start_time, kepler0, end_time, step, filename and optional force model settings)
+    
+    Returns:
+    --------
+    list of str: Result message of each run, in the order of jobs
+    """
+    return run_batch(run_orbitPrediction_numerical, jobs, "orbit prediction")
 
 
 if __name__ == "__main__":
@@ -8,6 +8,122 @@ classical two-body problem dynamics and Keplerian motion.
 import numpy as np
 import math
 
+from src.jitTools import njit, prange, NUMBA_AVAILABLE
+from src.orbitTools import kepler_frame, kpl2cts_anomaly, kpl2cts_soa, solve_kepler
+
+# Earth's gravitational parameter (km³/s²)
+MU_EARTH = 398600.4418
+
+
+@njit(cache=True, fastmath=True)
+def _propagate_loop(elements0, n, step_sec, num_steps):
+    """
+    JIT-compiled time-stepping loop: advance the mean anomaly and convert each
+    state to Cartesian coordinates
+
+    Returns the (num_steps, 6) Cartesian states and the final mean anomaly (degrees)
+    """
+    states = np.empty((num_steps, 6))
+    a, e, i, Omega, omega, M0 = (elements0[0], elements0[1], elements0[2],
+                                 elements0[3], elements0[4], elements0[5])
+    frame = kepler_frame(a, e, i, Omega, omega)
+    M_current = M0
+    # Mean anomaly advance per step (degrees); M is M0 + k*dM rather than a running sum,
+    # so the rounding error does not grow with the number of steps
+    dM = math.degrees(n * step_sec)
+    # Each Kepler solve starts from the previous E advanced by dE = dM / (1 - e*cos(E));
+    # solve_kepler falls back to its own seed when M wraps past 360 degrees
+    E = -1.0
+    for k in range(num_steps):
+        # Calculate current mean anomaly, kept in [0, 360) range
+        M_current = (M0 + k * dM) % 360.0
+        E, sin_E, cos_E = solve_kepler(math.radians(M_current), e, E)
+        (states[k, 0], states[k, 1], states[k, 2],
+         states[k, 3], states[k, 4], states[k, 5]) = kpl2cts_anomaly(frame, sin_E, cos_E)
+        E = E + n * step_sec / (1.0 - e * cos_E)
+    return states, M_current
+
+
+@njit(parallel=True, cache=True, fastmath=True)
+def _propagate_batch(elements0, n, step_sec, num_steps):
+    """
+    Parallel version of _propagate_loop over independent initial conditions
+
+    Returns the (N, num_steps, 6) Cartesian states and the (N,) final mean anomalies (degrees)
+    """
+    num_sats = elements0.shape[0]
+    states = np.empty((num_sats, num_steps, 6))
+    M_final = np.empty(num_sats)
+    for j in prange(num_sats):
+        a, e, i, Omega, omega, M0 = (elements0[j, 0], elements0[j, 1], elements0[j, 2],
+                                     elements0[j, 3], elements0[j, 4], elements0[j, 5])
+        frame = kepler_frame(a, e, i, Omega, omega)
+        M_current = M0
+        dM = math.degrees(n[j] * step_sec)
+        E = -1.0
+        for k in range(num_steps):
+            M_current = (M0 + k * dM) % 360.0
+            E, sin_E, cos_E = solve_kepler(math.radians(M_current), e, E)
+            (states[j, k, 0], states[j, k, 1], states[j, k, 2],
+             states[j, k, 3], states[j, k, 4], states[j, k, 5]) = kpl2cts_anomaly(frame, sin_E, cos_E)
+            E = E + n[j] * step_sec / (1.0 - e * cos_E)
+        M_final[j] = M_current
+    return states, M_final
+
+
+def _propagate_vec(elements0, n, step_sec, num_steps):
+    """
+    Vectorized equivalent of _propagate_loop, used when numba is unavailable:
+    all mean anomalies are computed at once and converted in one batched call
+
+    Returns the (num_steps, 6) Cartesian states and the final mean anomaly (degrees)
+    """
+    a, e, i, Omega, omega, M0 = (float(x) for x in elements0)
+    M = (M0 + np.arange(num_steps) * math.degrees(n * step_sec)) % 360.0
+    return kpl2cts_soa(a, e, i, Omega, omega, M), (M[-1] if num_steps > 0 else M0)
+
+
+def _propagate(elements0, n, step_sec, num_steps):
+    """
+    Propagate one satellite with the JIT loop, or the vectorized fallback without numba
+    """
+    if NUMBA_AVAILABLE:
+        return _propagate_loop(elements0, n, step_sec, num_steps)
+    return _propagate_vec(elements0, n, step_sec, num_steps)
+
+
+def _ephemeris_rows(mjd0, step_sec, num_steps, states):
+    """
+    Assemble ephemeris rows MJD_day MJD_sec x y z vx vy vz from Cartesian states
+    """
+    current_mjd = mjd0 + (np.arange(num_steps) * step_sec) / 86400.0
+    mjd_day = np.floor(current_mjd)
+    eph = np.empty((num_steps, 8), dtype=np.float64)
+    eph[:, 0] = mjd_day
+    eph[:, 1] = (current_mjd - mjd_day) * 86400.0
+    eph[:, 2:] = states
+    return eph
+
+
+_EPHEMERIS_HEADER = "# Ephemeris file: MJD_day MJD_sec x(km) y(km) z(km) vx(km/s) vy(km/s) vz(km/s)\n"
+_EPHEMERIS_ROW = "%d %.6f %.6f %.6f %.6f %.9f %.9f %.9f\n"
+
+
+def _write_ephemeris(fnEph, eph):
+    """
+    Write the ephemeris file in one call; a .npy filename stores the raw array
+
+    The text body is formatted with a single % operation over all rows, which gives
+    the same output as np.savetxt without its per-row Python loop
+    """
+    if fnEph.endswith('.npy'):
+        np.save(fnEph, eph)
+    else:
+        body = (_EPHEMERIS_ROW * len(eph)) % tuple(eph.ravel().tolist())
+        with open(fnEph, 'wb', buffering=1 << 20) as f:
+            f.write(_EPHEMERIS_HEADER.encode('ascii'))
+            f.write(body.encode('ascii'))
+
 
 def orbit_prediction_two_body(t0, elements0, step, duration, fnEph="eph.txt"):
     """
@@ -18,7 +134,8 @@ def orbit_prediction_two_body(t0, elements0, step, duration, fnEph="eph.txt"):
     elements0: Initial Keplerian elements [a, e, i, Omega, omega, M]
     step: Time step for prediction (minutes)
     duration: Total prediction time duration (minutes)
-    fnEph: Output ephemeris filename (absolute path)
+    fnEph: Output ephemeris filename (absolute path); a ".npy" filename
+        saves the (N, 8) ephemeris array in numpy binary format instead of text
 
     Returns:
     Final Keplerian elements at time t0 + duration
@@ -26,7 +143,6 @@ def orbit_prediction_two_body(t0, elements0, step, duration, fnEph="eph.txt"):
     
     # Import required functions
     from src.dateMJD import date2mjd, mjd2date
-    from src.orbitTools import kpl2cts, cts2kpl
     
     # Convert initial time to MJD
     time_str = f"{int(t0[0]):04d}-{int(t0[1]):02d}-{int(t0[2]):02d} {int(t0[3]):02d}:{int(t0[4]):02d}:{int(t0[5]):02d}"
@@ -35,11 +151,10 @@ def orbit_prediction_two_body(t0, elements0, step, duration, fnEph="eph.txt"):
     # Extract orbital elements
     a, e, i, Omega, omega, M0 = elements0
     
-    # Earth's gravitational parameter (km³/s²)
-    mu = 398600.4418  # GM_Earth
+    mu = MU_EARTH
     
     # Calculate mean motion (rad/s)
-    n = math.sqrt(mu / (a**3))
+    n = math.sqrt(mu / (a * a * a))
     
     # Convert step and duration from minutes to seconds
     step_sec = step * 60.0
@@ -48,41 +163,71 @@ def orbit_prediction_two_body(t0, elements0, step, duration, fnEph="eph.txt"):
     # Calculate number of steps
     num_steps = int(duration_sec / step_sec) + 1
     
-    # Open ephemeris file for writing
-    with open(fnEph, 'w') as f:
-        # Write header comment
-        f.write("# Ephemeris file: MJD_day MJD_sec x(km) y(km) z(km) vx(km/s) vy(km/s) vz(km/s)\n")
-        
-        # Initialize current elements
-        current_elements = elements0.copy()
-        
-        # Propagate orbit
-        for i in range(num_steps):
-            # Current time
-            current_time_sec = i * step_sec
-            current_mjd = mjd0 + current_time_sec / 86400.0
-            
-            # Calculate current mean anomaly
-            M_current = M0 + math.degrees(n * current_time_sec)
-            M_current = M_current % 360.0  # Keep in [0, 360) range
-            
-            # Update current elements with new mean anomaly
-            current_elements[5] = M_current
-            
-            # Convert to Cartesian coordinates
-            cartesian = kpl2cts(np.array(current_elements))
-            
-            # Split MJD into day and second components
-            mjd_day = int(current_mjd)
-            mjd_sec = (current_mjd - mjd_day) * 86400.0
-            
-            # Write to ephemeris file
-            f.write(f"{mjd_day} {mjd_sec:.6f} {cartesian[0]:.6f} {cartesian[1]:.6f} {cartesian[2]:.6f} "
-                   f"{cartesian[3]:.9f} {cartesian[4]:.9f} {cartesian[5]:.9f}\n")
+    # Propagate orbit
+    states, M_final = _propagate(np.asarray(elements0, dtype=np.float64),
+                                 n, step_sec, num_steps)
+    
+    # Final elements with the propagated mean anomaly
+    current_elements = elements0.copy()
+    current_elements[5] = float(M_final)
+    
+    _write_ephemeris(fnEph, _ephemeris_rows(mjd0, step_sec, num_steps, states))
     
     # Return final orbital elements
     return current_elements
 
+
+def orbit_prediction_two_body_batch(t0, elements0_batch, step, duration, fnEph_prefix="eph"):
+    """
+    Predict several satellite orbits from a common epoch using two-body problem dynamics,
+    propagating the satellites in parallel
+
+    Parameters:
+    t0: Initial time as [year, month, day, hour, minute, second]
+    elements0_batch: List of initial Keplerian elements, each [a, e, i, Omega, omega, M]
+    step: Time step for prediction (minutes)
+    duration: Total prediction time duration (minutes)
+    fnEph_prefix: Output ephemeris filename prefix (absolute path); satellite k is
+        written to f"{fnEph_prefix}_{k:04d}.txt"
+
+    Returns:
+    List of final Keplerian elements at time t0 + duration, one per satellite
+    """
+    from src.dateMJD import date2mjd
+    
+    # Convert initial time to MJD
+    time_str = f"{int(t0[0]):04d}-{int(t0[1]):02d}-{int(t0[2]):02d} {int(t0[3]):02d}:{int(t0[4]):02d}:{int(t0[5]):02d}"
+    mjd0 = date2mjd(time_str)
+    
+    elements0 = np.asarray(elements0_batch, dtype=np.float64).reshape(-1, 6)
+    
+    # Calculate mean motion of every satellite (rad/s)
+    a = elements0[:, 0]
+    n = np.sqrt(MU_EARTH / (a * a * a))
+    
+    step_sec = step * 60.0
+    duration_sec = duration * 60.0
+    num_steps = int(duration_sec / step_sec) + 1
+    
+    # Propagate all satellites, then write the files outside the parallel region
+    if NUMBA_AVAILABLE:
+        states, M_final = _propagate_batch(elements0, n, step_sec, num_steps)
+    else:
+        states = np.empty((elements0.shape[0], num_steps, 6))
+        M_final = np.empty(elements0.shape[0])
+        for k in range(elements0.shape[0]):
+            states[k], M_final[k] = _propagate_vec(elements0[k], n[k], step_sec, num_steps)
+    
+    final_elements = []
+    for k in range(elements0.shape[0]):
+        _write_ephemeris(f"{fnEph_prefix}_{k:04d}.txt",
+                         _ephemeris_rows(mjd0, step_sec, num_steps, states[k]))
+        elements1 = [float(x) for x in elements0[k]]
+        elements1[5] = float(M_final[k])
+        final_elements.append(elements1)
+    
+    return final_elements
+
 if __name__ == "__main__":
     # Test the orbit prediction function
     t0 = [2000, 1, 1, 0, 0, 0]
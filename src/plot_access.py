@@ -2,6 +2,9 @@ import os
 from src.access import Access
 from src.visualize import visualize_access
 
+# 有效的观测数据类型
+_VALID_OBS_TYPES = frozenset({'Azi_Ele', 'RA_DEC', 'R_RD'})
+
 def plot_access(access_file_path, station_name, satellite_name, obs_type, output_file=None):
     """
     读取访问数据文件并绘制可视化图表
@@ -19,10 +22,9 @@ def plot_access(access_file_path, station_name, satellite_name, obs_type, output
     """
     
     # 验证观测类型
-    valid_obs_types = ['Azi_Ele', 'RA_DEC', 'R_RD']
-    if obs_type not in valid_obs_types:
-        print(f"错误: 无效的观测类型 '{obs_type}'. 有效类型: {valid_obs_types}")
-        return f"错误: 无效的观测类型 '{obs_type}'. 有效类型: {valid_obs_types}"
+    if obs_type not in _VALID_OBS_TYPES:
+        print(f"错误: 无效的观测类型 '{obs_type}'. 有效类型: {sorted(_VALID_OBS_TYPES)}")
+        return f"错误: 无效的观测类型 '{obs_type}'. 有效类型: {sorted(_VALID_OBS_TYPES)}"
     
     # 检查文件是否存在
     if not os.path.exists(access_file_path):
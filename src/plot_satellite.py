@@ -1,9 +1,30 @@
 import datetime
+from concurrent.futures import ThreadPoolExecutor
 import matplotlib.pyplot as plt
 from src.Satellite import Satellite
 from src.satelliteScenario import SatelliteScenario
 from src.visualize import visualize_orbits, visualize_ground_track
 
+# 并行处理多个星历文件时的最大线程数
+MAX_WORKERS = 8
+
+
+def _build_satellite(job):
+    """
+    创建卫星对象，加载星历数据并计算星下点轨迹
+    
+    参数:
+    job (tuple): (星历文件路径, 卫星名称, 卫星ID)
+    
+    返回:
+    Satellite: 已加载星历和星下点轨迹的卫星对象
+    """
+    eph_file, name, sat_id = job
+    satellite = Satellite(name=name, satellite_id=sat_id)
+    satellite.load_ephemeris_data(eph_file)
+    satellite.calculate_ground_track()
+    return satellite
+
 def plot_satellite(ephemeris_file, start_time, end_time, sat_name='sat', sat_id='sat-001',
                   orbit_plot='data/orbit_plot.png', ground_track='data/ground_track.png',
                   time_step=60.0):
@@ -46,17 +67,22 @@ def plot_satellite(ephemeris_file, start_time, end_time, sat_name='sat', sat_id=
     if len(sat_ids) > 1 and len(sat_ids) != len(ephemeris_files):
         raise ValueError("sat_id count must match ephemeris_file count")
     
+    # 创建卫星对象
+    jobs = []
     for i, eph_file in enumerate(ephemeris_files):
-        # 创建卫星对象
         name = sat_names[i] if len(sat_names) > 1 else f"{sat_names[0]}-{i+1}"
         sat_id = sat_ids[i] if len(sat_ids) > 1 else f"{sat_ids[0]}-{i+1}"
-        satellite = Satellite(name=name, satellite_id=sat_id)
-        
-        # 加载星历数据
-        satellite.load_ephemeris_data(eph_file)
-        satellite.calculate_ground_track()
-        
-        # 添加卫星到场景
+        jobs.append((eph_file, name, sat_id))
+    
+    # 加载星历并计算星下点（多个文件时并行处理，各文件相互独立）
+    if len(jobs) > 1:
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(jobs))) as executor:
+            satellites = list(executor.map(_build_satellite, jobs))
+    else:
+        satellites = [_build_satellite(jobs[0])]
+    
+    # 添加卫星到场景（串行且按文件顺序，保证颜色分配不变）
+    for satellite in satellites:
         scenario.add_satellite(satellite)
         
     # 更新场景时间范围
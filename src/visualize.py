@@ -47,14 +47,16 @@ def visualize_orbits(scenario, time=None):
             color_rgb = [c/255 for c in orbit_color]
         
         # 绘制整个轨道 - 设置高zorder确保在地球前面
+        # 轨道线点数多，保存为矢量图时栅格化，坐标轴、文字和图例仍为矢量
         if len(satellite.eph['cartesian']) > 0:
-            positions = satellite.eph['cartesian'][:, :3]  # 取位置部分
+            # 取位置部分，仅用于绘图，单精度足够
+            positions = np.asarray(satellite.eph['cartesian'][:, :3], dtype=np.float32)
             if satellite.showLabel:
                 ax.plot(positions[:, 0], positions[:, 1], positions[:, 2], 
-                        color=color_rgb, linewidth=2, label=satellite.name, zorder=10)
+                        color=color_rgb, linewidth=2, label=satellite.name, zorder=10, rasterized=True)
             else:
                 ax.plot(positions[:, 0], positions[:, 1], positions[:, 2], 
-                        color=color_rgb, linewidth=2, zorder=10)
+                        color=color_rgb, linewidth=2, zorder=10, rasterized=True)
             
         # 存储当前时间的卫星位置，稍后绘制
         if time is None:
@@ -149,37 +151,10 @@ def plot_earth_with_texture_fixed(earth, ax):
     修复版本：使用贴图绘制地球，减少遮挡
     """
     try:
-        # 将贴图转换为numpy数组
-        texture_array = np.array(earth.texture_image)
-        
-        # 关键：使用原始坐标计算纹理映射，这样旋转时纹理会保持固定
-        lon = np.arctan2(earth.y_original, earth.x_original)
-        lat = np.arcsin(np.clip(earth.z_original / earth.radius, -1, 1))
-        
-        u = (lon + np.pi) / (2 * np.pi)
-        v = (-lat + np.pi/2) / np.pi  # 翻转v坐标，修复上下颠倒问题
-        
-        u = np.clip(u, 0, 1)
-        v = np.clip(v, 0, 1)
-        
-        # 映射到图像像素
-        img_height, img_width = texture_array.shape[:2]
-        u_pixels = np.clip((u * (img_width - 1)).astype(int), 0, img_width - 1)
-        v_pixels = np.clip((v * (img_height - 1)).astype(int), 0, img_height - 1)
-        
-        # 获取颜色值
-        if len(texture_array.shape) == 3:
-            colors = texture_array[v_pixels, u_pixels] / 255.0
-        else:
-            gray_values = texture_array[v_pixels, u_pixels] / 255.0
-            colors = np.stack([gray_values, gray_values, gray_values], axis=-1)
-        
         # 关键修复：大幅提高透明度，降低zorder
-        surface = ax.plot_surface(earth.x, earth.y, earth.z, 
-                                 facecolors=colors,
-                                 alpha=0.4,  # 提高透明度
-                                 antialiased=False,
-                                 shade=False)
+        # 贴图颜色由Earth对象缓存，旋转时无需重新采样
+        surface = earth.add_textured_surface(ax, alpha=0.4)  # 提高透明度
+        surface.set_rasterized(True)  # 面片数量多，保存为矢量图时栅格化
         
         # 手动设置zorder（如果支持的话）
         try:
@@ -198,7 +173,8 @@ def plot_earth_simple_fixed(earth, ax):
     surface = ax.plot_surface(earth.x, earth.y, earth.z, 
                              color='lightblue', 
                              alpha=0.3,  # 提高透明度
-                             antialiased=False)
+                             antialiased=False,
+                             rasterized=True)  # 面片数量多，保存为矢量图时栅格化
     
     # 手动设置zorder（如果支持的话）
     try:
@@ -287,11 +263,11 @@ def visualize_stations(scenario, projection='PlateCarree', figsize=(15, 8),
     # 调整子图位置，为标题、底部和colorbar留出空间
     plt.subplots_adjust(top=0.85, bottom=0.1, left=0.05, right=0.9)
     
-    # 添加地图要素
-    ax.add_feature(cfeature.COASTLINE, linewidth=0.5)
-    ax.add_feature(cfeature.BORDERS, linewidth=0.3)
-    ax.add_feature(cfeature.LAND, color='lightgray', alpha=0.3)
-    ax.add_feature(cfeature.OCEAN, color='lightblue', alpha=0.3)
+    # 添加地图要素（几何图形复杂，保存为矢量图时栅格化）
+    ax.add_feature(cfeature.COASTLINE, linewidth=0.5, rasterized=True)
+    ax.add_feature(cfeature.BORDERS, linewidth=0.3, rasterized=True)
+    ax.add_feature(cfeature.LAND, color='lightgray', alpha=0.3, rasterized=True)
+    ax.add_feature(cfeature.OCEAN, color='lightblue', alpha=0.3, rasterized=True)
     
     # 设置全球范围
     if projection in ['PlateCarree', 'Robinson', 'Mollweide']:
@@ -435,7 +411,8 @@ def visualize_stations(scenario, projection='PlateCarree', figsize=(15, 8),
     return fig, ax
 
 
-def visualize_ground_track(scenario, projection='PlateCarree', figsize=(15, 8)):
+def visualize_ground_track(scenario, projection='PlateCarree', figsize=(15, 8), backend='matplotlib',
+                           dpi=None):
     """
     使用cartopy绘制卫星星下点轨迹的二维世界地图
     
@@ -444,6 +421,10 @@ def visualize_ground_track(scenario, projection='PlateCarree', figsize=(15, 8)):
     projection (str): 地图投影方式，默认为'PlateCarree'
                      可选: 'PlateCarree', 'Robinson', 'Mollweide', 'Orthographic'
     figsize (tuple): 图形尺寸
+    backend (str): 轨迹线的绘制方式，默认为'matplotlib'（逐段绘制折线）；
+                   'datashader'时先将所有卫星的轨迹栅格化为一张图像再显示，适合点数很多的轨迹
+                   （需要安装datashader，未安装时使用matplotlib）
+    dpi (float): datashader绘制时图像的分辨率，应与保存图形时的dpi相同，默认为图形的dpi
     
     返回:
     tuple: (fig, ax) matplotlib图形对象和轴对象
@@ -473,11 +454,11 @@ def visualize_ground_track(scenario, projection='PlateCarree', figsize=(15, 8)):
     # 调整子图位置，为标题和底部留出空间
     plt.subplots_adjust(top=0.85, bottom=0.1, left=0.05, right=0.95)
     
-    # 添加地图要素
-    ax.add_feature(cfeature.COASTLINE, linewidth=0.5)
-    ax.add_feature(cfeature.BORDERS, linewidth=0.3)
-    ax.add_feature(cfeature.LAND, color='lightgray', alpha=0.3)
-    ax.add_feature(cfeature.OCEAN, color='lightblue', alpha=0.3)
+    # 添加地图要素（几何图形复杂，保存为矢量图时栅格化）
+    ax.add_feature(cfeature.COASTLINE, linewidth=0.5, rasterized=True)
+    ax.add_feature(cfeature.BORDERS, linewidth=0.3, rasterized=True)
+    ax.add_feature(cfeature.LAND, color='lightgray', alpha=0.3, rasterized=True)
+    ax.add_feature(cfeature.OCEAN, color='lightblue', alpha=0.3, rasterized=True)
     
     # 设置全球范围 - 必须在添加要素之前设置
     if projection in ['PlateCarree', 'Robinson', 'Mollweide']:
@@ -499,10 +480,17 @@ def visualize_ground_track(scenario, projection='PlateCarree', figsize=(15, 8)):
     else:
         ax.gridlines(alpha=0.5, linestyle='--')
     
+    if backend == 'datashader' and not _datashader_available():
+        print("Warning: datashader is not installed, drawing ground tracks with matplotlib")
+        backend = 'matplotlib'
+    
     # 标记是否已经添加了通用的Start和End标签
     start_label_added = False
     end_label_added = False
     
+    # datashader绘制时收集各卫星的轨迹段和颜色，最后一起栅格化
+    shaded_tracks = []
+    
     # 绘制每个卫星的星下点轨迹
     for i, satellite in enumerate(scenario.satellites):
         # 确保卫星有星下点数据
@@ -514,8 +502,8 @@ def visualize_ground_track(scenario, projection='PlateCarree', figsize=(15, 8)):
             print(f"Warning: Ground track calculation failed for satellite {satellite.name}, skipping")
             continue
         
-        # 获取经纬度数据
-        ground_track = np.array(satellite.ground_track)
+        # 获取经纬度数据，仅用于绘图，单精度足够
+        ground_track = np.asarray(satellite.ground_track, dtype=np.float32)
         longitudes = ground_track[:, 0]
         latitudes = ground_track[:, 1]
         
@@ -530,12 +518,16 @@ def visualize_ground_track(scenario, projection='PlateCarree', figsize=(15, 8)):
             color_rgb = [c/255 for c in orbit_color]
         
         # 绘制轨迹段（不添加label）
-        for lon_seg, lat_seg in zip(lon_segments, lat_segments):
-            if len(lon_seg) > 1:  # 只绘制有效的轨迹段
-                ax.plot(lon_seg, lat_seg, 
-                       color=color_rgb, 
-                       linewidth=1.5, 
-                       transform=ccrs.PlateCarree())
+        if backend == 'datashader':
+            shaded_tracks.append((lon_segments, lat_segments, color_rgb))
+        else:
+            for lon_seg, lat_seg in zip(lon_segments, lat_segments):
+                if len(lon_seg) > 1:  # 只绘制有效的轨迹段
+                    ax.plot(lon_seg, lat_seg, 
+                           color=color_rgb, 
+                           linewidth=1.5, 
+                           transform=ccrs.PlateCarree(),
+                           rasterized=True)  # 轨迹点数多，保存为矢量图时栅格化
         
         # 绘制起始点和结束点
         if len(longitudes) > 0:
@@ -604,9 +596,73 @@ def visualize_ground_track(scenario, projection='PlateCarree', figsize=(15, 8)):
     # 调整布局，确保标题和内容完全显示
     plt.tight_layout(pad=3.0)
     
+    if shaded_tracks:
+        # 布局确定后按坐标轴在保存图像中的像素大小栅格化，图像像素与屏幕像素一一对应
+        ax.apply_aspect()
+        raster_dpi = dpi or fig.dpi
+        bbox = ax.get_window_extent()
+        width = max(1, int(np.ceil(bbox.width * raster_dpi / fig.dpi)))
+        height = max(1, int(np.ceil(bbox.height * raster_dpi / fig.dpi)))
+        # 线宽与matplotlib绘制时相同（1.5磅）
+        spread = max(0, int(round((1.5 * raster_dpi / 72 - 1) / 2)))
+        track_image = _shade_tracks(shaded_tracks, width, height, spread)
+        ax.imshow(track_image, origin='lower', extent=(-180, 180, -90, 90),
+                  transform=ccrs.PlateCarree(), interpolation='nearest', zorder=3)
+    
     return fig, ax
 
 
+def _datashader_available():
+    """
+    检查可选依赖datashader是否已安装
+    """
+    try:
+        import datashader  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _shade_tracks(tracks, plot_width, plot_height, spread=0):
+    """
+    使用datashader将所有卫星的星下点轨迹栅格化为一张全球经纬度范围的RGBA图像
+    
+    每颗卫星单独聚合并着色为一层，按卫星顺序叠加（后面的卫星在上层，与matplotlib绘制顺序相同），
+    内存占用与卫星数量无关
+    
+    参数:
+    tracks (list): 每颗卫星的(经度段列表, 纬度段列表, 轨迹颜色)，经纬度段为_split_track_at_dateline的结果
+    plot_width (int): 图像宽度（像素），对应经度-180~180度
+    plot_height (int): 图像高度（像素），对应纬度-90~90度
+    spread (int): 轨迹线向四周扩展的像素数，用于加粗1像素宽的线
+    
+    返回:
+    np.array: 形状(plot_height, plot_width, 4)的uint8 RGBA图像，第一行为纬度-90度；轨迹经过的像素不透明，其余透明
+    """
+    import datashader as ds
+    import datashader.transfer_functions as tf
+    import pandas as pd
+    from matplotlib.colors import to_hex
+    
+    canvas = ds.Canvas(plot_width=plot_width, plot_height=plot_height,
+                       x_range=(-180, 180), y_range=(-90, 90))
+    
+    # 各轨迹段首尾相接，段之间插入NaN，datashader在NaN处断开折线
+    separator = np.array([np.nan], dtype=np.float32)
+    image = None
+    for lon_segments, lat_segments, color in tracks:
+        lon = np.concatenate([part for seg in lon_segments for part in (seg, separator)])
+        lat = np.concatenate([part for seg in lat_segments for part in (seg, separator)])
+        agg = canvas.line(pd.DataFrame({'lon': lon, 'lat': lat}), 'lon', 'lat', agg=ds.any())
+        layer = tf.shade(agg, cmap=[to_hex(color)], min_alpha=255)
+        if spread > 0:
+            layer = tf.spread(layer, px=spread)
+        image = layer if image is None else tf.stack(image, layer)
+    
+    # datashader图像每个像素为一个uint32（RGBA字节顺序），第一行为y最小处
+    return np.ascontiguousarray(image.data).view(np.uint8).reshape(plot_height, plot_width, 4)
+
+
 def _split_track_at_dateline(longitudes, latitudes, threshold=180):
     """
     处理跨越日界线(180度经线)的轨迹，将其分割为多个连续段
@@ -622,34 +678,18 @@ def _split_track_at_dateline(longitudes, latitudes, threshold=180):
     if len(longitudes) == 0:
         return [], []
     
-    lon_segments = []
-    lat_segments = []
+    longitudes = np.asarray(longitudes)
+    latitudes = np.asarray(latitudes)
     
-    current_lon = [longitudes[0]]
-    current_lat = [latitudes[0]]
+    # 相邻点经度差超过阈值即跨越日界线，一次性找出所有分割位置
+    breaks = np.flatnonzero(np.abs(np.diff(longitudes)) > threshold) + 1
+    lon_parts = np.split(longitudes, breaks)
+    lat_parts = np.split(latitudes, breaks)
     
-    for i in range(1, len(longitudes)):
-        # 检查是否跨越日界线
-        lon_diff = abs(longitudes[i] - longitudes[i-1])
-        
-        if lon_diff > threshold:
-            # 跨越日界线，结束当前段
-            if len(current_lon) > 1:
-                lon_segments.append(np.array(current_lon))
-                lat_segments.append(np.array(current_lat))
-            
-            # 开始新的段
-            current_lon = [longitudes[i]]
-            current_lat = [latitudes[i]]
-        else:
-            # 继续当前段
-            current_lon.append(longitudes[i])
-            current_lat.append(latitudes[i])
-    
-    # 添加最后一段
-    if len(current_lon) > 0:
-        lon_segments.append(np.array(current_lon))
-        lat_segments.append(np.array(current_lat))
+    # 跨越日界线前只有单个点的段不绘制，最后一段总是保留
+    last = len(lon_parts) - 1
+    lon_segments = [seg for k, seg in enumerate(lon_parts) if len(seg) > 1 or k == last]
+    lat_segments = [seg for k, seg in enumerate(lat_parts) if len(seg) > 1 or k == last]
     
     return lon_segments, lat_segments
 
@@ -739,8 +779,8 @@ def visualize_azi_ele(access_obj, figsize=(12, 8), show_grid=True):
     ax4 = plt.subplot(2, 2, 4, projection='polar')
     
     # 提取数据
-    times = access_obj.times
-    data = np.array(access_obj.data)
+    times = access_obj.times_as_datetime()
+    data = np.asarray(access_obj.data, dtype=np.float32)  # 仅用于绘图，单精度足够
     azimuths = data[:, 0]
     elevations = data[:, 1]
     
@@ -882,8 +922,8 @@ def visualize_ra_dec(access_obj, figsize=(12, 8), show_grid=True):
     ax4 = plt.subplot(2, 2, 4)  # 天球投影图
     
     # 提取数据
-    times = access_obj.times
-    data = np.array(access_obj.data)
+    times = access_obj.times_as_datetime()
+    data = np.asarray(access_obj.data, dtype=np.float32)  # 仅用于绘图，单精度足够
     ra = data[:, 0]   # 赤经
     dec = data[:, 1]  # 赤纬
     
@@ -1003,8 +1043,8 @@ def visualize_r_rd(access_obj, figsize=(12, 8), show_grid=True):
     ax4 = plt.subplot(2, 2, 4)  # 距离和距离变化率的双y轴图
     
     # 提取数据
-    times = access_obj.times
-    data = np.array(access_obj.data)
+    times = access_obj.times_as_datetime()
+    data = np.asarray(access_obj.data, dtype=np.float32)  # 仅用于绘图，单精度足够
     ranges = data[:, 0]      # 距离 (km)
     range_rates = data[:, 1] # 距离变化率 (km/s)
     
@@ -1160,7 +1200,7 @@ def visualize_multiple_access(access_list, obs_type_filter=None, figsize=(15, 10
             if len(acc.data) == 0:
                 continue
                 
-            times = acc.times
+            times = acc.times_as_datetime()
             data = np.array(acc.data)
             color = colors[j % len(colors)]
             label = f"{acc.station_id}-{acc.satellite_id}"